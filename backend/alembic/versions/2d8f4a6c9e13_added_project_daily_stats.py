@@ -0,0 +1,40 @@
+"""Added project daily stats
+
+Revision ID: 2d8f4a6c9e13
+Revises: 7b3e9d21c6f4
+Create Date: 2026-10-17 17:40:26.019384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f4a6c9e13'
+down_revision: Union[str, Sequence[str], None] = '7b3e9d21c6f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'project_daily_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('todo', sa.Integer(), nullable=False),
+        sa.Column('in_progress', sa.Integer(), nullable=False),
+        sa.Column('in_review', sa.Integer(), nullable=False),
+        sa.Column('done', sa.Integer(), nullable=False),
+        sa.Column('remaining_hours', sa.Float(), nullable=False, comment='Estimated hours of tasks not done'),
+        sa.Column('hours_logged', sa.Float(), nullable=False, comment='Time logged that day'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_daily_stats')
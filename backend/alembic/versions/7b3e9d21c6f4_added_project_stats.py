@@ -0,0 +1,59 @@
+"""Added project stats
+
+Revision ID: 7b3e9d21c6f4
+Revises: e4a7b2c91d35
+Create Date: 2026-10-17 16:02:11.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d21c6f4'
+down_revision: Union[str, Sequence[str], None] = 'e4a7b2c91d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'project_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('total_tasks', sa.Integer(), nullable=False),
+        sa.Column('todo', sa.Integer(), nullable=False),
+        sa.Column('in_progress', sa.Integer(), nullable=False),
+        sa.Column('in_review', sa.Integer(), nullable=False),
+        sa.Column('done', sa.Integer(), nullable=False),
+        sa.Column('estimated_hours', sa.Float(), nullable=False),
+        sa.Column('actual_hours', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id'),
+    )
+    # Backfill from the current tasks
+    op.execute(
+        """
+        INSERT INTO project_stats
+            (project_id, total_tasks, todo, in_progress, in_review, done, estimated_hours, actual_hours)
+        SELECT p.id,
+               COUNT(t.id),
+               COALESCE(SUM(CASE WHEN t.status = 'todo' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.status = 'in_progress' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.status = 'in_review' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.status = 'done' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(t.estimated_hours), 0),
+               COALESCE(SUM(t.actual_hours), 0)
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_stats')
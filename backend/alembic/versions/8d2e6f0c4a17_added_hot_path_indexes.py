@@ -0,0 +1,67 @@
+"""Added hot path indexes and project_members primary key
+
+Revision ID: 8d2e6f0c4a17
+Revises: 3f1c2a9b7d41
+Create Date: 2026-10-17 10:04:18.552903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e6f0c4a17'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9b7d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # --- project_members: drop duplicate / orphan rows, then add the composite PK ---
+    op.execute(
+        "CREATE TABLE project_members_dedup AS "
+        "SELECT DISTINCT project_id, user_id FROM project_members "
+        "WHERE project_id IS NOT NULL AND user_id IS NOT NULL"
+    )
+    op.execute("DELETE FROM project_members")
+    op.execute(
+        "INSERT INTO project_members (project_id, user_id) "
+        "SELECT project_id, user_id FROM project_members_dedup"
+    )
+    op.execute("DROP TABLE project_members_dedup")
+
+    op.alter_column('project_members', 'project_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('project_members', 'user_id', existing_type=sa.Integer(), nullable=False)
+    op.create_primary_key('pk_project_members', 'project_members', ['project_id', 'user_id'])
+    op.create_index('ix_project_members_user_project', 'project_members', ['user_id', 'project_id'])
+
+    # --- tasks ---
+    op.create_index('ix_tasks_project_status', 'tasks', ['project_id', 'status'])
+    op.create_index('ix_tasks_assignee_id', 'tasks', ['assignee_id'])
+    op.create_index('ix_tasks_due_date_status', 'tasks', ['due_date', 'status'])
+
+    # --- history / time logs / comments ---
+    op.create_index('ix_task_history_task_created_at', 'task_history', ['task_id', 'created_at'])
+    op.create_index('ix_project_history_project_timestamp', 'project_history', ['project_id', 'timestamp'])
+    op.create_index('ix_time_logs_task_log_date', 'time_logs', ['task_id', 'log_date'])
+    op.create_index('ix_comments_task_id', 'comments', ['task_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_task_id', table_name='comments')
+    op.drop_index('ix_time_logs_task_log_date', table_name='time_logs')
+    op.drop_index('ix_project_history_project_timestamp', table_name='project_history')
+    op.drop_index('ix_task_history_task_created_at', table_name='task_history')
+
+    op.drop_index('ix_tasks_due_date_status', table_name='tasks')
+    op.drop_index('ix_tasks_assignee_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_status', table_name='tasks')
+
+    op.drop_index('ix_project_members_user_project', table_name='project_members')
+    op.drop_constraint('pk_project_members', 'project_members', type_='primary')
+    op.alter_column('project_members', 'user_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('project_members', 'project_id', existing_type=sa.Integer(), nullable=True)
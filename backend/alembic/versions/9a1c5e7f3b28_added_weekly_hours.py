@@ -0,0 +1,41 @@
+"""Added weekly hours
+
+Revision ID: 9a1c5e7f3b28
+Revises: 2d8f4a6c9e13
+Create Date: 2026-10-17 18:55:43.631207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1c5e7f3b28'
+down_revision: Union[str, Sequence[str], None] = '2d8f4a6c9e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'weekly_hours',
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('hours', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('week_start', 'project_id', 'user_id'),
+    )
+    op.create_index('ix_weekly_hours_user_week', 'weekly_hours', ['user_id', 'week_start'])
+    op.create_index('ix_weekly_hours_project_week', 'weekly_hours', ['project_id', 'week_start'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_weekly_hours_project_week', table_name='weekly_hours')
+    op.drop_index('ix_weekly_hours_user_week', table_name='weekly_hours')
+    op.drop_table('weekly_hours')
@@ -0,0 +1,70 @@
+"""Added history archive tables
+
+Revision ID: c51b9e3d7f20
+Revises: 8d2e6f0c4a17
+Create Date: 2026-10-17 11:26:53.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51b9e3d7f20'
+down_revision: Union[str, Sequence[str], None] = '8d2e6f0c4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HISTORY_ACTIONS = (
+    'created', 'updated', 'status_changed', 'assigned', 'reassigned',
+    'comment_added', 'time_logged', 'ADDED', 'REMOVED',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_history_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('action', sa.Enum(*HISTORY_ACTIONS, name='historyaction'), nullable=False),
+        sa.Column('field_name', sa.String(length=100), nullable=True, comment='Field that was changed'),
+        sa.Column('old_value', sa.Text(), nullable=True, comment='Previous value'),
+        sa.Column('new_value', sa.Text(), nullable=True, comment='New value'),
+        sa.Column('changes', sa.JSON(), nullable=True, comment='JSON object of all changes'),
+        sa.Column('description', sa.Text(), nullable=True, comment='Human readable description'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_history_archive_task_created_at', 'task_history_archive', ['task_id', 'created_at'])
+
+    op.create_table(
+        'project_history_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(length=255), nullable=False),
+        sa.Column('field', sa.String(length=255), nullable=True),
+        sa.Column('old_value', sa.String(length=500), nullable=True),
+        sa.Column('new_value', sa.String(length=500), nullable=True),
+        sa.Column('changes', sa.JSON(), nullable=True, comment='JSON object of all changes'),
+        sa.Column('description', sa.Text(), nullable=True, comment='Human readable description'),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_project_history_archive_project_timestamp', 'project_history_archive', ['project_id', 'timestamp'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_history_archive_project_timestamp', table_name='project_history_archive')
+    op.drop_table('project_history_archive')
+    op.drop_index('ix_task_history_archive_task_created_at', table_name='task_history_archive')
+    op.drop_table('task_history_archive')
@@ -0,0 +1,30 @@
+"""Added task list sort indexes
+
+Revision ID: e4a7b2c91d35
+Revises: c51b9e3d7f20
+Create Date: 2026-10-17 14:21:37.104215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7b2c91d35'
+down_revision: Union[str, Sequence[str], None] = 'c51b9e3d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_created_at', 'tasks', ['created_at'])
+    op.create_index('ix_tasks_updated_at', 'tasks', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_updated_at', table_name='tasks')
+    op.drop_index('ix_tasks_created_at', table_name='tasks')
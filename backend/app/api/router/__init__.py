@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from . import auth, users, projects, comments, reporting, tasks, role_routes, time_logs
+from . import auth, users, projects, comments, reporting, tasks, role_routes, time_logs, admin, exports
 router = APIRouter()
 router.include_router(auth.router, prefix='/auth', tags=['auth'])
 router.include_router(users.router, prefix='/users', tags=['users'])
@@ -9,6 +9,7 @@ router.include_router(reporting.router, prefix='/reporting', tags=['reporting'])
 # Tasks as top-level
 router.include_router(tasks.router, prefix='/tasks', tags=['tasks'])
 router.include_router(time_logs.router)
+router.include_router(exports.router, prefix='/exports', tags=['exports'])
 
 # Tasks nested under projects (future-proof, still works)
 router.include_router(
@@ -16,4 +17,5 @@ router.include_router(
     prefix='/projects/{project_id}/tasks',
     tags=['tasks']
 )
-router.include_router(role_routes.router) 
\ No newline at end of file
+router.include_router(role_routes.router)
+router.include_router(admin.router) 
\ No newline at end of file
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.db.database import pool_stats
+from app.db.replicas import replica_router
+from app.deps import get_current_principal, Principal
+from app.security.principal_cache import principal_cache, token_version_cache
+from app.security.password import password_hasher
+from app.utils.history_sink import history_sink
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(current_user: Principal = Depends(get_current_principal)):
+    if not current_user.role or current_user.role.name != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges")
+    return current_user
+
+
+# --------------------------------------------
+# 🏊 DB connection pool (this worker)
+# --------------------------------------------
+@router.get("/db-pool")
+def db_pool(current_user: Principal = Depends(require_admin)):
+    return pool_stats()
+
+
+# --------------------------------------------
+# 📊 All in-process metrics (this worker)
+# --------------------------------------------
+@router.get("/metrics")
+def metrics(current_user: Principal = Depends(require_admin)):
+    return {
+        "db_pool": pool_stats(),
+        "db_replicas": replica_router.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_version_cache": token_version_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "history_write_behind": history_sink.stats(),
+    }
@@ -4,24 +4,14 @@ from sqlalchemy.orm import Session
 from app.db import models, schemas
 from app.db.database import get_db
 from app.db.models import User, Role
-from passlib.context import CryptContext
 from app.security.jwt import create_access_token
+from app.security.password import hash_password, verify_password, password_hasher
 from app.db.schemas import UserCreate, Token, UserOut, UserLogin  # make sure Token schema exists
 from app.deps import get_current_user
 from app.core.config import settings
 
 router = APIRouter()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Utility functions
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 # Register user endpoint
 @router.post("/register", response_model=UserOut)
 def register_user(user_in: UserCreate, db: Session = Depends(get_db),
@@ -87,7 +77,12 @@ def login_for_access_token(user_in: UserLogin, db: Session = Depends(get_db)):
     # Get role name from Role relationship
     role_name = user.role.name if user.role else None
 
-    token_data = {"user_id": user.id, "email": user.email, "role": role_name}
+    token_data = {
+        "user_id": user.id,
+        "email": user.email,
+        "role": role_name,
+        "ver": user.token_version or 0,  # bumped on deactivation / password / role change
+    }
     token = create_access_token(token_data)
 
     return {"access_token": token, "token_type": "bearer"}
@@ -103,13 +98,13 @@ async def change_password(payload: schemas.ChangePasswordRequest,
         raise HTTPException(status_code=404, detail="User not found")
 
     # verify old password
-    if not verify_password(payload.old_password, user.hashed_password):
+    if not await password_hasher.verify_async(payload.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Old password is incorrect"
         )
 
     # update new password
-    user.hashed_password = hash_password(payload.new_password)
+    user.hashed_password = await password_hasher.hash_async(payload.new_password)
     db.commit()
     return {"message": "Password updated successfully"}
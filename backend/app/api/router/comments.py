@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db import models, schemas
 from app.db.database import get_db
-from app.deps import get_current_user
+from app.deps import get_current_user, get_current_principal, Principal
 from typing import List
 from sqlalchemy.orm import joinedload
+from app.utils.responses import adapter_response
 
 router = APIRouter()
 
@@ -32,7 +33,7 @@ def add_comment(
 def list_comments(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not task:
@@ -45,14 +46,16 @@ def list_comments(
         .all()
     )
 
-    # Add can_delete flag for frontend
+    # Add can_delete flag for frontend. Each comment is validated once here;
+    # the adapter then dumps the models without validating them again.
+    is_admin = current_user.role.name == "admin"
     comments_out = []
     for c in comments:
-        comment_dict = schemas.CommentOut.from_orm(c).dict()
-        comment_dict["can_delete"] = current_user.role.name == "admin" or c.author_id == current_user.id
-        comments_out.append(comment_dict)
+        comment = schemas.CommentOut.model_validate(c)
+        comment.can_delete = is_admin or c.author_id == current_user.id
+        comments_out.append(comment)
 
-    return comments_out
+    return adapter_response(schemas.comment_list_adapter, comments_out, validated=True)
 
 
 @router.delete('/{comment_id}')
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.api.router.reporting import require_manager_or_admin
+from app.db.replicas import read_session_factory
+from app.deps import get_current_principal, Principal
+from app.services import exports
+from app.services.projects_service import visible_project_ids
+
+router = APIRouter()
+
+# Streamed exports (admins and managers). Nothing is buffered: the
+# generator opens its own session and writes one keyset page at a time,
+# so memory stays flat however many rows match.
+ExportFormat = Literal["ndjson", "csv"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _export(request: Request, name: str, stmts, fmt: ExportFormat) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        exports.stream_export(read_session_factory(request), stmts, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
+
+
+def _scope(current_user: Principal):
+    # 🔒 Managers only export projects they belong to
+    require_manager_or_admin(current_user)
+    return None if current_user.role.name == "admin" else visible_project_ids(current_user.id)
+
+
+# --------------------------------------------
+# 📤 Tasks (date range on created_at)
+# --------------------------------------------
+@router.get("/tasks")
+def export_tasks(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    project_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_principal),
+):
+    stmts = exports.task_export_stmts(project_id, since, until, _scope(current_user))
+    return _export(request, "tasks", stmts, format)
+
+
+# --------------------------------------------
+# 📤 Time logs (date range on log_date)
+# --------------------------------------------
+@router.get("/time-logs")
+def export_time_logs(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    project_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_principal),
+):
+    stmts = exports.time_log_export_stmts(project_id, since, until, _scope(current_user))
+    return _export(request, "time-logs", stmts, format)
+
+
+# --------------------------------------------
+# 📤 History, archive + hot tiers (date range on the event time)
+# --------------------------------------------
+@router.get("/task-history")
+def export_task_history(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    project_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_principal),
+):
+    stmts = exports.task_history_export_stmts(project_id, since, until, _scope(current_user))
+    return _export(request, "task-history", stmts, format)
+
+
+@router.get("/project-history")
+def export_project_history(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    project_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_principal),
+):
+    stmts = exports.project_history_export_stmts(project_id, since, until, _scope(current_user))
+    return _export(request, "project-history", stmts, format)
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select
 from app.db import models, schemas
-from app.db.database import get_db
-from app.deps import get_current_user
-from typing import List
+from app.db.database import get_db, use_async_variant
+from app.db.replicas import get_read_db, get_async_read_db
+from app.deps import get_current_user, get_current_principal, get_current_principal_async, Principal
+from typing import List, Optional
 from app.utils.project_history_utils import log_project_history, detect_project_changes
+from app.services.history_archiver import page_tiers
+from app.services.project_stats import done_percent
+from app.services.access import is_project_member, require_project_view, require_project_view_async
+from app.services.projects_service import (
+    PROJECT_SUMMARY_COLUMNS, attach_member_ids, load_member_ids, member_ids_stmt,
+    progress_batch_result, progress_batch_stmt, visible_project_ids,
+)
+from app.services.tasks_service import task_out_loaders
+from app.services.versions import history_version, project_history_version_stmt, project_version, project_version_stmt
+from app.utils.conditional import not_modified, set_version_headers
+from app.utils.pagination import decode_cursor, keyset_after
+from app.utils.projections import View
+from app.utils.responses import adapter_response
 
 router = APIRouter()
 
@@ -51,10 +66,8 @@ def create_project(
 
     # --- Save ---
     db.add(project)
-    db.commit()
-    db.refresh(project)
 
-    # Log project creation
+    # Log project creation (project id is resolved at commit)
     log_project_history(
         db=db,
         project=project,
@@ -64,88 +77,115 @@ def create_project(
         new_value=f"Project '{project.title}' created"
     )
 
+    # Ids are known before the commit expires the members
+    member_ids = sorted(m.id for m in members)
+
+    db.commit()
+    db.refresh(project)
+    project.preload_member_ids(member_ids)
+
     return project
 
 
 # ---------------------------
 # LIST ALL PROJECTS
 # ---------------------------
-@router.get('/', response_model=List[schemas.ProjectOut])
-def list_projects(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
-):
+def _project_list_stmt(current_user):
+    stmt = select(models.Project)
+
     # ✅ Admins see all projects
     if current_user.role.name == "admin":
-        return db.query(models.Project).all()
+        return stmt
 
     # ✅ Managers & Developers see only projects where they are members
-    member_projects = (
-        db.query(models.Project)
-        .join(models.Project.members)  # join the association table
-        .filter(models.User.id == current_user.id)
-        .all()
-    )
+    return stmt.where(models.Project.id.in_(visible_project_ids(current_user.id)))
 
-    return member_projects
+async def list_projects_async(
+    view: View = "full",
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    stmt = _project_list_stmt(current_user)
+    if view == "summary":
+        rows = (await db.execute(stmt.with_only_columns(*PROJECT_SUMMARY_COLUMNS))).all()
+        return adapter_response(schemas.project_summaries_adapter, rows)
+    projects = (await db.scalars(stmt)).all()
+    if projects:
+        attach_member_ids(projects, (await db.execute(member_ids_stmt([p.id for p in projects]))).all())
+    return projects
+
+@router.get('/', response_model=List[schemas.ProjectOut])
+@use_async_variant(list_projects_async)
+def list_projects(
+    view: View = "full",
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    stmt = _project_list_stmt(current_user)
+    # ?view=summary: ProjectSummary rows from a column-only SELECT
+    if view == "summary":
+        return adapter_response(schemas.project_summaries_adapter, db.execute(stmt.with_only_columns(*PROJECT_SUMMARY_COLUMNS)).all())
+    # One query for the projects + one for all their member ids
+    return load_member_ids(db, db.scalars(stmt).all())
 
 # ---------------------------
 # GET PROJECTS PROGRESS
 # ---------------------------
 @router.get("/progress", response_model=List[schemas.ProjectProgress])
 @router.get("/progress/", response_model=List[schemas.ProjectProgress])
-def get_project_progress(db: Session = Depends(get_db)):
-    result = (
-        db.query(
-            models.Task.project_id,
-            func.count(models.Task.id).label("total"),
-            func.sum(case((models.Task.status == 'done', 1), else_=0)).label("completed")
-        )
-        .group_by(models.Task.project_id)
-        .all()
-    )
+def get_project_progress(db: Session = Depends(get_read_db)):
+    # Read from project_stats; projects without tasks are still left out
+    rows = db.scalars(select(models.ProjectStats).where(models.ProjectStats.total_tasks > 0)).all()
+    return [_progress(stats.project_id, stats) for stats in rows]
 
-    progress_list = []
-    for proj_id, total, completed in result:
-        total = int(total or 0)
-        completed = int(completed or 0)
-        completion_percent = (completed / total * 100) if total > 0 else 0.0
-        progress_list.append(
-            schemas.ProjectProgress(
-                project_id=int(proj_id),
-                total_tasks=total,
-                completed_tasks=completed,
-                completion_percent=completion_percent
-            )
-        )
 
-    return progress_list
+def _progress(project_id: int, stats: Optional[models.ProjectStats]) -> schemas.ProjectProgress:
+    return schemas.ProjectProgress(
+        project_id=project_id,
+        total_tasks=stats.total_tasks if stats else 0,
+        completed_tasks=stats.done if stats else 0,
+        completion_percent=done_percent(stats),
+    )
+
+# ---------------------------
+# GET BATCH PROGRESS (?ids=1&ids=2, or all of the caller's projects)
+# ---------------------------
+MAX_BATCH_PROJECTS = 500
+
+def _progress_batch_scope(current_user, ids: Optional[List[int]]):
+    if ids is not None and len(ids) > MAX_BATCH_PROJECTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PROJECTS} project ids per request")
+    # Same visibility as the project listing; ids outside it are left out
+    scope = _project_list_stmt(current_user).with_only_columns(models.Project.id)
+    if ids is not None:
+        scope = scope.where(models.Project.id.in_(ids))
+    return scope
+
+async def get_project_progress_batch_async(
+    ids: Optional[List[int]] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    stmt = progress_batch_stmt(_progress_batch_scope(current_user, ids))
+    return progress_batch_result((await db.execute(stmt)).all())
+
+@router.get("/progress/batch", response_model=List[schemas.ProjectProgressBatch])
+@use_async_variant(get_project_progress_batch_async)
+def get_project_progress_batch(
+    ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    stmt = progress_batch_stmt(_progress_batch_scope(current_user, ids))
+    return progress_batch_result(db.execute(stmt).all())
 
 # ---------------------------
 # GET SINGLE PROJECT PROGRESS
 # ---------------------------
 @router.get("/{project_id}/progress", response_model=schemas.ProjectProgress)
-def get_single_project_progress(project_id: int, db: Session = Depends(get_db)):
-    total_tasks = (
-        db.query(func.count(models.Task.id))
-        .filter(models.Task.project_id == project_id)
-        .scalar()
-    )
-
-    completed_tasks = (
-        db.query(func.count(models.Task.id))
-        .filter(models.Task.project_id == project_id, models.Task.status == "done")
-        .scalar()
-    )
-
-    completion_percent = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
-
-    return schemas.ProjectProgress(
-        project_id=project_id,
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        completion_percent=completion_percent,
-    )
+def get_single_project_progress(project_id: int, db: Session = Depends(get_read_db)):
+    # Primary-key lookup on the maintained counters
+    return _progress(project_id, db.get(models.ProjectStats, project_id))
 
 # ---------------------------
 # GET USER PROJECTS
@@ -153,56 +193,86 @@ def get_single_project_progress(project_id: int, db: Session = Depends(get_db)):
 @router.get("/user", response_model=List[schemas.ProjectOut])
 @router.get("/user/", response_model=List[schemas.ProjectOut])
 def get_user_projects(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    view: View = "full",
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
-    member_projects = (
-        db.query(models.Project)
-        .join(models.Project.members)
-        .filter(models.User.id == current_user.id)
-        .all()
+    # Projects the user is a member of, or has tasks assigned in
+    assigned_project_ids = select(models.Task.project_id).where(models.Task.assignee_id == current_user.id)
+    stmt = select(models.Project).where(
+        models.Project.id.in_(visible_project_ids(current_user.id))
+        | models.Project.id.in_(assigned_project_ids)
     )
-
-    task_projects = (
-        db.query(models.Project)
-        .join(models.Task)
-        .filter(models.Task.assignee_id == current_user.id)
-        .all()
-    )
-
-    # Combine and remove duplicates
-    project_dict = {p.id: p for p in member_projects + task_projects}
-    return list(project_dict.values())
+    if view == "summary":
+        return adapter_response(schemas.project_summaries_adapter, db.execute(stmt.with_only_columns(*PROJECT_SUMMARY_COLUMNS)).all())
+    return load_member_ids(db, db.scalars(stmt).all())
 
 
 # ---------------------------
 # GET SINGLE PROJECT
 # ---------------------------
+def _project_detail_stmt(project_id: int):
+    return (
+        select(models.Project)
+        .options(
+            selectinload(models.Project.members).selectinload(models.User.role),
+            selectinload(models.Project.tasks).options(*task_out_loaders()),  # TaskMini
+        )
+        .where(models.Project.id == project_id)
+    )
+
+def _project_summary_stmt(project_id: int):
+    return select(*PROJECT_SUMMARY_COLUMNS).where(models.Project.id == project_id)
+
+async def get_project_async(
+    project_id: int,
+    request: Request,
+    response: Response,
+    view: View = "full",
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    await require_project_view_async(db, project_id, current_user)
+    version = project_version((await db.execute(project_version_stmt(project_id))).one())
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+    if view == "summary":
+        row = (await db.execute(_project_summary_stmt(project_id))).first()
+        return set_version_headers(adapter_response(schemas.project_summary_adapter, row), version)
+    project = (await db.scalars(_project_detail_stmt(project_id))).first()
+    if not project:
+        raise HTTPException(status_code=404, detail='Project not found')
+    set_version_headers(response, version)
+    return project
+
 @router.get('/{project_id}', response_model=schemas.ProjectDetail)
+@use_async_variant(get_project_async)
 def get_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    view: View = "full",
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    project = (
-        db.query(models.Project)
-        .filter(models.Project.id == project_id)
-        .first()
-    )
-
+    # Access is an EXISTS lookup; members and tasks are only loaded for the response
+    require_project_view(db, project_id, current_user)
+
+    # Polling clients get a 304 after just the version aggregate
+    version = project_version(db.execute(project_version_stmt(project_id)).one())
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    # ?view=summary: just the project's own columns, no tasks / members
+    if view == "summary":
+        row = db.execute(_project_summary_stmt(project_id)).first()
+        return set_version_headers(adapter_response(schemas.project_summary_adapter, row), version)
+    project = db.scalars(_project_detail_stmt(project_id)).first()
     if not project:
         raise HTTPException(status_code=404, detail='Project not found')
-
-    if current_user.role.name not in ('admin', 'manager'):
-        # Restrict if user not member or assignee
-        if not any(m.id == current_user.id for m in project.members) and \
-           not any(t.assignee_id == current_user.id for t in project.tasks):
-            raise HTTPException(status_code=403, detail='Not permitted')
-
-    # Ensure relationships are loaded
-    _ = project.members
-    _ = project.tasks
-
+    set_version_headers(response, version)
     return project
 
 
@@ -356,9 +426,6 @@ def toggle_archive_project(project_id:int, archive:bool, db:Session=Depends(get_
     old_value = project.is_archived
     project.is_archived = archive
 
-    db.commit()
-    db.refresh(project)
-
     log_project_history(
         db=db,
         project=project,
@@ -369,7 +436,10 @@ def toggle_archive_project(project_id:int, archive:bool, db:Session=Depends(get_
         new_value=archive,
     )
 
-    return project
+    db.commit()
+    db.refresh(project)
+
+    return load_member_ids(db, [project])[0]
 
 
 # ─────────────────────────────
@@ -434,8 +504,8 @@ def add_members(
 @router.get("/{project_id}/members", response_model=list[schemas.UserTaskMember])
 def get_project_members(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     if current_user.role.name not in ("admin", "manager"):
         raise HTTPException(
@@ -444,8 +514,7 @@ def get_project_members(
         )
 
     # Fetch project
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if not project:
+    if db.get(models.Project, project_id) is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # --- Access Control ---
@@ -453,11 +522,17 @@ def get_project_members(
         raise HTTPException(status_code=403, detail="Access denied")
 
     # Managers and developers can only view projects they are members of
-    if current_user.role.name != "admin" and current_user not in project.members:
+    if current_user.role.name != "admin" and not is_project_member(db, project_id, current_user.id):
         raise HTTPException(status_code=403, detail="You are not a member of this project")
 
     # --- Return members ---
-    return project.members
+    pm = models.project_members
+    return db.scalars(
+        select(models.User)
+        .join(pm, pm.c.user_id == models.User.id)
+        .options(selectinload(models.User.role))
+        .where(pm.c.project_id == project_id)
+    ).all()
 
 
 # ─────────────────────────────
@@ -494,9 +569,6 @@ def remove_members(
             project.members.remove(m)
             removed_members.append(m)
 
-    db.commit()
-    db.refresh(project)
-
     # ------------------------------
     # LOGGING WITH MEMBER NAMES
     # ------------------------------
@@ -513,6 +585,9 @@ def remove_members(
             new_value=", ".join(removed_names),  # <-- serialize list to comma-separated string
         )
 
+    db.commit()
+    db.refresh(project)
+
     return {
         "ok": True,
         "message": "Members removed",
@@ -520,12 +595,65 @@ def remove_members(
     }
 
 
-@router.get("/{project_id}/history", response_model=List[schemas.ProjectHistoryOut])
-def get_project_history(project_id: int, db: Session = Depends(get_db)):
-    logs = (
-        db.query(models.ProjectHistory)
-        .filter(models.ProjectHistory.project_id == project_id)
-        .order_by(models.ProjectHistory.timestamp.desc())
-        .all()
+def _project_history_stmts(project_id: int, limit: int, cursor=None, action=None, field=None):
+    # Hot table + archive tier (see app/services/history_archiver.py),
+    # keyset-paged on (timestamp, id), limit + 1 rows per tier
+    stmts = []
+    for model in (models.ProjectHistory, models.ProjectHistoryArchive):
+        stmt = (
+            select(model)
+            .options(selectinload(model.user))
+            .where(model.project_id == project_id)
+        )
+        if action:
+            stmt = stmt.where(model.action == action)
+        if field:
+            stmt = stmt.where(model.field == field)
+        after = keyset_after(model.timestamp, model.id, cursor)
+        if after is not None:
+            stmt = stmt.where(after)
+        stmts.append(stmt.order_by(model.timestamp.desc(), model.id.desc()).limit(limit + 1))
+    return stmts
+
+async def get_project_history_async(
+    project_id: int,
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    field: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    version = history_version(
+        "project_history", project_id, (await db.execute(project_history_version_stmt(project_id))).one()
     )
-    return logs
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    stmts = _project_history_stmts(project_id, limit, decode_cursor(cursor, 2), action, field)
+    hot, cold = [(await db.scalars(stmt)).all() for stmt in stmts]
+    history, next_cursor = page_tiers(hot, cold, "timestamp", limit)
+    return set_version_headers(adapter_response(schemas.project_history_list_adapter, history, next_cursor), version)
+
+@router.get("/{project_id}/history", response_model=List[schemas.ProjectHistoryOut])
+@use_async_variant(get_project_history_async)
+def get_project_history(
+    project_id: int,
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    field: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    # Newest first; pass the X-Next-Cursor header back as ?cursor= for older entries
+    version = history_version("project_history", project_id, db.execute(project_history_version_stmt(project_id)).one())
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    stmts = _project_history_stmts(project_id, limit, decode_cursor(cursor, 2), action, field)
+    hot, cold = (db.scalars(stmt).all() for stmt in stmts)
+    history, next_cursor = page_tiers(hot, cold, "timestamp", limit)
+    return set_version_headers(adapter_response(schemas.project_history_list_adapter, history, next_cursor), version)
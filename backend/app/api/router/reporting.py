@@ -1,19 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from datetime import datetime
+from sqlalchemy import and_, func, case, true
+from datetime import date, datetime, timedelta
+from typing import Optional
 from app.db import models
-from app.db.database import get_db
-from app.deps import get_current_user
+from app.db.database import use_async_variant
+from app.db.replicas import get_read_db, get_async_read_db
+from app.deps import get_current_principal, get_current_principal_async, Principal
+from app.services.project_stats import STATUS_COLUMNS
+from app.services import timesheets
+from app.services.projects_service import visible_project_ids
+from app.services.rollups import daily_stats_stmt
 from sqlalchemy import select
 
 router = APIRouter()
 
+# Every report is built from a statement (shared by the sync and async
+# handlers) plus a pure function that shapes the rows into the response.
+
 
 # --------------------------------------------
 # 🔒 Utility: Access control
 # --------------------------------------------
-def require_manager_or_admin(current_user: models.User):
+def require_manager_or_admin(current_user: Principal):
     if not current_user.role or current_user.role.name not in ("admin", "manager"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -24,20 +34,13 @@ def require_manager_or_admin(current_user: models.User):
 # --------------------------------------------
 # 📊 Task Counts by Status (Overall)
 # --------------------------------------------
-@router.get("/task_counts")
-def task_counts(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
-):
-    require_manager_or_admin(current_user)
-
-    q = (
-        db.query(models.Task.status, func.count(models.Task.id))
-        .group_by(models.Task.status)
-        .all()
-    )
+def _task_counts_stmt():
+    # Summed over the project_stats rows instead of scanning tasks
+    return select(*[func.coalesce(func.sum(getattr(models.ProjectStats, column)), 0) for column in STATUS_COLUMNS])
 
-    result = {status: count for status, count in q}
+def _task_counts_result(row):
+    # Same shape as before: only statuses that have tasks
+    result = {status: int(count) for status, count in zip(STATUS_COLUMNS, row) if count}
 
     # Include total count and percent breakdown
     total_tasks = sum(result.values()) or 0
@@ -50,25 +53,38 @@ def task_counts(
     result["total_tasks"] = total_tasks
     return result
 
+async def task_counts_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    require_manager_or_admin(current_user)
+    return _task_counts_result((await db.execute(_task_counts_stmt())).one())
+
+@router.get("/task_counts")
+@use_async_variant(task_counts_async)
+def task_counts(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    require_manager_or_admin(current_user)
+    return _task_counts_result(db.execute(_task_counts_stmt()).one())
+
 
 # --------------------------------------------
 # 📈 Project Progress (per project)
 # --------------------------------------------
-@router.get("/project_progress/{project_id}")
-def project_progress(
-    project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
-):
-    require_manager_or_admin(current_user)
+def _project_progress_stmt(project_id: int):
+    # Primary-key lookup on the maintained counters
+    return select(
+        models.ProjectStats.total_tasks.label("total"),
+        models.ProjectStats.done.label("done"),
+        models.ProjectStats.in_progress.label("in_progress"),
+    ).where(models.ProjectStats.project_id == project_id)
 
-    total = db.query(func.count(models.Task.id)).filter(models.Task.project_id == project_id).scalar() or 0
-    done = db.query(func.count(models.Task.id)).filter(
-        models.Task.project_id == project_id, models.Task.status == "done"
-    ).scalar() or 0
-    in_progress = db.query(func.count(models.Task.id)).filter(
-        models.Task.project_id == project_id, models.Task.status == "in_progress"
-    ).scalar() or 0
+def _project_progress_result(project_id: int, counts: dict):
+    total = int(counts["total"] or 0)
+    done = int(counts["done"] or 0)
+    in_progress = int(counts["in_progress"] or 0)
     todo = total - (done + in_progress)
 
     progress = (done / total * 100) if total > 0 else 0.0
@@ -82,31 +98,47 @@ def project_progress(
         "progress_percent": round(progress, 2)
     }
 
+async def project_progress_async(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    require_manager_or_admin(current_user)
+    row = (await db.execute(_project_progress_stmt(project_id))).first()
+    counts = row._asdict() if row else {"total": 0, "done": 0, "in_progress": 0}
+    return _project_progress_result(project_id, counts)
 
-# --------------------------------------------
-# ⏰ Overdue Tasks by Project
-# --------------------------------------------
-@router.get("/overdue_by_project")
-def overdue_by_project(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+@router.get("/project_progress/{project_id}")
+@use_async_variant(project_progress_async)
+def project_progress(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     require_manager_or_admin(current_user)
+    row = db.execute(_project_progress_stmt(project_id)).first()
+    counts = row._asdict() if row else {"total": 0, "done": 0, "in_progress": 0}
+    return _project_progress_result(project_id, counts)
+
 
+# --------------------------------------------
+# ⏰ Overdue Tasks by Project
+# --------------------------------------------
+def _overdue_by_project_stmt():
     now = datetime.utcnow()
 
-    results = (
-        db.query(
+    return (
+        select(
             models.Project.id.label("project_id"),
             models.Project.title.label("project_title"),
             func.count(models.Task.id).label("overdue_tasks")
         )
         .join(models.Task, models.Task.project_id == models.Project.id)
-        .filter(models.Task.due_date < now, models.Task.status != "done")
+        .where(models.Task.due_date < now, models.Task.status != "done")
         .group_by(models.Project.id)
-        .all()
     )
 
+def _overdue_by_project_result(results):
     return [
         {
             "project_id": r.project_id,
@@ -116,82 +148,70 @@ def overdue_by_project(
         for r in results
     ]
 
+async def overdue_by_project_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    require_manager_or_admin(current_user)
+    return _overdue_by_project_result((await db.execute(_overdue_by_project_stmt())).all())
+
+@router.get("/overdue_by_project")
+@use_async_variant(overdue_by_project_async)
+def overdue_by_project(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    require_manager_or_admin(current_user)
+    return _overdue_by_project_result(db.execute(_overdue_by_project_stmt()).all())
+
 
 # --------------------------------------------
 # 🧾 Summary Dashboard (NEW)
 # --------------------------------------------
-@router.get("/summary")
-def summary_dashboard(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
-):
+def _summary_stmt(current_user: Principal):
+    # One SELECT over three derived tables: task counts by conditional
+    # aggregation, plus project and user counts
+    Task, pm = models.Task, models.project_members
+    task_counts = select(
+        func.count(Task.id).label("total_tasks"),
+        func.sum(case((and_(Task.due_date < datetime.utcnow(), Task.status != "done"), 1), else_=0)).label("overdue_tasks"),
+        func.sum(case((Task.status == "done", 1), else_=0)).label("completed_tasks"),
+    )
+
     # --------------------------------------------------
     # 1️⃣ ADMIN — can see everything
     # --------------------------------------------------
     if current_user.role.name == "admin":
-        total_projects = db.query(func.count(models.Project.id)).scalar() or 0
-        total_tasks = db.query(func.count(models.Task.id)).scalar() or 0
-        total_users = db.query(func.count(models.User.id)).scalar() or 0
-
-        overdue_tasks = db.query(func.count(models.Task.id)).filter(
-            models.Task.due_date < datetime.utcnow(),
-            models.Task.status != "done"
-        ).scalar() or 0
-
-        completed_tasks = db.query(func.count(models.Task.id)).filter(
-            models.Task.status == "done"
-        ).scalar() or 0
+        projects = select(func.count(models.Project.id).label("total_projects"))
+        users = select(func.count(models.User.id).label("total_users"))
 
     # --------------------------------------------------
     # 2️⃣ MANAGER / DEVELOPER — only their projects
     # --------------------------------------------------
     else:
-        # Get all project IDs where this user is a member
-        project_ids = select(
-            db.query(models.project_members.c.project_id)
-                .filter(models.project_members.c.user_id == current_user.id)
-                .subquery()
-        )
-
-        # Count projects they are part of
-        total_projects = (
-            db.query(func.count(models.Project.id))
-            .filter(models.Project.id.in_(project_ids))
-            .scalar() or 0
+        # Joined against the user's memberships instead of re-running an IN subquery per count
+        mine = pm.alias("mine")
+        task_counts = task_counts.join(
+            mine, and_(mine.c.project_id == Task.project_id, mine.c.user_id == current_user.id)
         )
-
-        # Count tasks only from those projects
-        total_tasks = (
-            db.query(func.count(models.Task.id))
-            .filter(models.Task.project_id.in_(project_ids))
-            .scalar() or 0
-        )
-
+        # (project_id, user_id) is the primary key, so one membership row per project
+        projects = select(func.count(pm.c.project_id).label("total_projects")).where(pm.c.user_id == current_user.id)
         # ✅ Count users only inside the user's projects
-        total_users = (
-            db.query(func.count(func.distinct(models.project_members.c.user_id)))
-            .filter(models.project_members.c.project_id.in_(project_ids))
-            .scalar() or 0
+        users = (
+            select(func.count(func.distinct(pm.c.user_id)).label("total_users"))
+            .join(mine, and_(mine.c.project_id == pm.c.project_id, mine.c.user_id == current_user.id))
         )
 
-        overdue_tasks = (
-            db.query(func.count(models.Task.id))
-            .filter(
-                models.Task.project_id.in_(project_ids),
-                models.Task.due_date < datetime.utcnow(),
-                models.Task.status != "done"
-            )
-            .scalar() or 0
-        )
+    # Each derived table is a single row: join them ON TRUE (an explicit cross join)
+    counts, project_count, user_count = task_counts.subquery(), projects.subquery(), users.subquery()
+    return select(counts, project_count, user_count).select_from(
+        counts.join(project_count, true()).join(user_count, true())
+    )
 
-        completed_tasks = (
-            db.query(func.count(models.Task.id))
-            .filter(
-                models.Task.project_id.in_(project_ids),
-                models.Task.status == "done"
-            )
-            .scalar() or 0
-        )
+def _summary_result(counts: dict):
+    # SUM() comes back as Decimal on MySQL
+    total_tasks = int(counts["total_tasks"] or 0)
+    completed_tasks = int(counts["completed_tasks"] or 0)
 
     # Final stats
     progress_percent = (
@@ -201,11 +221,203 @@ def summary_dashboard(
 
     return {
         "totals": {
-            "projects": total_projects,
+            "projects": counts["total_projects"] or 0,
             "tasks": total_tasks,
-            "users": total_users   # None for non-admin
+            "users": counts["total_users"] or 0   # None for non-admin
         },
         "completed_tasks": completed_tasks,
-        "overdue_tasks": overdue_tasks,
+        "overdue_tasks": int(counts["overdue_tasks"] or 0),
         "overall_progress_percent": round(progress_percent, 2)
     }
+
+async def summary_dashboard_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    counts = (await db.execute(_summary_stmt(current_user))).one()._asdict()
+    return _summary_result(counts)
+
+@router.get("/summary")
+@use_async_variant(summary_dashboard_async)
+def summary_dashboard(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    counts = db.execute(_summary_stmt(current_user)).one()._asdict()
+    return _summary_result(counts)
+
+
+# --------------------------------------------
+# 📉 Burndown & Cumulative Flow (daily rollups)
+# --------------------------------------------
+# Both read only project_daily_stats rows for the window (default: last
+# 30 days); the rows are written by app/services/rollups.py.
+def _window(since: Optional[date], until: Optional[date]):
+    until = until or datetime.utcnow().date()
+    since = since or until - timedelta(days=29)
+    if since > until:
+        raise HTTPException(status_code=400, detail="'since' must not be after 'until'")
+    return since, until
+
+def _burndown_result(rows):
+    return [
+        {
+            "day": r.day,
+            "remaining_tasks": r.todo + r.in_progress + r.in_review,
+            "remaining_hours": r.remaining_hours,
+            "done": r.done,
+            "hours_logged": r.hours_logged,
+        }
+        for r in rows
+    ]
+
+def _cfd_result(rows):
+    return [{"day": r.day, **{status: getattr(r, status) for status in STATUS_COLUMNS}} for r in rows]
+
+async def burndown_async(
+    project_id: int,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    require_manager_or_admin(current_user)
+    return _burndown_result((await db.scalars(daily_stats_stmt(project_id, *_window(since, until)))).all())
+
+@router.get("/projects/{project_id}/burndown")
+@use_async_variant(burndown_async)
+def burndown(
+    project_id: int,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    require_manager_or_admin(current_user)
+    return _burndown_result(db.scalars(daily_stats_stmt(project_id, *_window(since, until))).all())
+
+async def cumulative_flow_async(
+    project_id: int,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    require_manager_or_admin(current_user)
+    return _cfd_result((await db.scalars(daily_stats_stmt(project_id, *_window(since, until)))).all())
+
+@router.get("/projects/{project_id}/cfd")
+@use_async_variant(cumulative_flow_async)
+def cumulative_flow(
+    project_id: int,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    require_manager_or_admin(current_user)
+    return _cfd_result(db.scalars(daily_stats_stmt(project_id, *_window(since, until))).all())
+
+
+# --------------------------------------------
+# 🕒 Timesheets & hours (time_logs)
+# --------------------------------------------
+# Default window: the current month so far (billing). ?source=rollup reads
+# the weekly_hours rollup instead of time_logs (weekly granularity only;
+# as fresh as the last rollup run).
+def _hours_window(since: Optional[date], until: Optional[date]):
+    until = until or datetime.utcnow().date()
+    since = since or until.replace(day=1)
+    if since > until:
+        raise HTTPException(status_code=400, detail="'since' must not be after 'until'")
+    return since, until
+
+def _hours_scope(current_user: Principal):
+    # 🔒 Managers only see hours logged on projects they belong to
+    require_manager_or_admin(current_user)
+    return None if current_user.role.name == "admin" else visible_project_ids(current_user.id)
+
+def _hours_by_user_query(since, until, granularity, source, project_id, user_id, scope):
+    since, until = _hours_window(since, until)
+    if source == "rollup":
+        if granularity != "week":
+            raise HTTPException(status_code=400, detail="source=rollup only supports granularity=week")
+        return timesheets.weekly_by_user_stmt(since, until, project_id, user_id, scope), "week_start"
+    return timesheets.hours_by_user_stmt(since, until, project_id, user_id, scope), "day"
+
+def _hours_by_project_query(since, until, source, project_id, scope):
+    since, until = _hours_window(since, until)
+    if source == "rollup":
+        return timesheets.weekly_by_project_stmt(since, until, project_id, scope), "week_start"
+    return timesheets.hours_by_project_stmt(since, until, project_id, scope), "day"
+
+async def hours_by_user_async(
+    granularity: timesheets.Granularity = "week",
+    source: timesheets.Source = "live",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    project_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    stmt, period = _hours_by_user_query(since, until, granularity, source, project_id, user_id, _hours_scope(current_user))
+    return timesheets.fold((await db.execute(stmt)).all(), ("user_id", "user_name"), granularity, period)
+
+@router.get("/hours/by_user")
+@use_async_variant(hours_by_user_async)
+def hours_by_user(
+    granularity: timesheets.Granularity = "week",
+    source: timesheets.Source = "live",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    project_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    stmt, period = _hours_by_user_query(since, until, granularity, source, project_id, user_id, _hours_scope(current_user))
+    return timesheets.fold(db.execute(stmt).all(), ("user_id", "user_name"), granularity, period)
+
+async def hours_by_project_async(
+    source: timesheets.Source = "live",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    stmt, period = _hours_by_project_query(since, until, source, project_id, _hours_scope(current_user))
+    return timesheets.fold((await db.execute(stmt)).all(), ("project_id", "project_title"), "week", period)
+
+@router.get("/hours/by_project")
+@use_async_variant(hours_by_project_async)
+def hours_by_project(
+    source: timesheets.Source = "live",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    project_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    stmt, period = _hours_by_project_query(since, until, source, project_id, _hours_scope(current_user))
+    return timesheets.fold(db.execute(stmt).all(), ("project_id", "project_title"), "week", period)
+
+async def hours_estimates_async(
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    stmt = timesheets.estimates_stmt([project_id] if project_id is not None else None, _hours_scope(current_user))
+    return timesheets.estimates_result((await db.execute(stmt)).all())
+
+@router.get("/hours/estimates")
+@use_async_variant(hours_estimates_async)
+def hours_estimates(
+    project_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Estimated vs actual per project, from the maintained project_stats
+    stmt = timesheets.estimates_stmt([project_id] if project_id is not None else None, _hours_scope(current_user))
+    return timesheets.estimates_result(db.execute(stmt).all())
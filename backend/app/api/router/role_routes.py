@@ -3,13 +3,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db import models, schemas, database
 from typing import List
-from app.deps import get_current_user
+from app.deps import get_current_principal, Principal
 
 router = APIRouter(prefix="/roles", tags=["Roles"])
 
 @router.get("/", response_model=List[schemas.RoleOut])
 def get_all_roles(db: Session = Depends(database.get_db),
-                  current_user: models.User = Depends(get_current_user)):
+                  current_user: Principal = Depends(get_current_principal)):
     
     if current_user.role.name.lower() == 'developer':        
         raise HTTPException(
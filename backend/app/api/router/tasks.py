@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from app.db import models, schemas
-from app.db.database import get_db
-from app.deps import get_current_user
+from app.db.database import get_db, use_async_variant
+from app.db.replicas import get_read_db, get_async_read_db
+from app.deps import get_current_user, get_current_principal, get_current_principal_async, Principal
 from datetime import datetime
 from typing import Optional
 from app.utils.task_history_utils import log_task_history
 from app.utils.project_history_utils import log_project_history
+from app.services.access import is_project_member, is_project_member_async
+from app.services.history_archiver import page_tiers
+from app.services.tasks_service import (
+    TaskListParams, apply_task_list_params, task_list_params, task_out_loaders, task_page, task_page_async,
+)
+from app.services.versions import history_version, task_history_version_stmt, task_version, task_version_stmt
+from app.utils.conditional import not_modified, set_version_headers
+from app.utils.pagination import decode_cursor, keyset_after
+from app.utils.responses import adapter_response
 
 router = APIRouter()
 
@@ -49,17 +61,15 @@ def create_task(
         assignee = db.query(models.User).filter(models.User.id == task_in.assignee_id).first()
         if not assignee:
             raise HTTPException(status_code=404, detail="Assignee not found")
-        if assignee not in project.members:
+        if project is not None and not is_project_member(db, project.id, assignee.id):
             raise HTTPException(status_code=400, detail="Assignee must be a member of the project")
         task.assignee = assignee
 
     task.createdBy = current_user
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
 
-    # Log task history
+    # Log task history (ids are resolved at commit)
     log_task_history(
         db=db,
         task=task,
@@ -81,58 +91,123 @@ def create_task(
             description=f"{current_user.name} added task '{task.title}'"
         )
 
+    # One commit: task + both history rows
+    db.commit()
+
+    # Reload with the relations TaskOut renders (same statement as get_task)
+    return db.scalars(_task_detail_stmt(task.id)).one()
+
+def _task_detail_stmt(task_id: int):
+    return (
+        select(models.Task)
+        .options(*task_out_loaders(with_project=True))
+        .where(models.Task.id == task_id)
+    )
+
+def _can_view_without_membership(task, current_user) -> bool:
+    # Admin can always access; so can the assignee
+    return current_user.role.name == 'admin' or task.assignee_id == current_user.id
+
+def _task_not_found():
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+async def get_task_async(
+    request: Request,
+    response: Response,
+    task_id: int = Path(..., description="The ID of the task"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    row = (await db.execute(task_version_stmt(task_id))).first()
+    if not row:
+        raise _task_not_found()
+
+    if not _can_view_without_membership(row, current_user):
+        if row.project_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        if not await is_project_member_async(db, row.project_id, current_user.id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not permitted")
+
+    version = task_version(row)
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    task = (await db.scalars(_task_detail_stmt(task_id))).first()
+    if not task:
+        raise _task_not_found()
+    set_version_headers(response, version)
     return task
 
 @router.get("/{task_id}", response_model=schemas.TaskDetails)
+@use_async_variant(get_task_async)
 def get_task(
+    request: Request,
+    response: Response,
     task_id: int = Path(..., description="The ID of the task"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    # Version row first: enough for the access check and for a 304
+    row = db.execute(task_version_stmt(task_id)).first()
+    if not row:
+        raise _task_not_found()
+
+    if not _can_view_without_membership(row, current_user):
+        # Check if user is member of the project
+        if row.project_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        if not is_project_member(db, row.project_id, current_user.id):
+            # Otherwise forbid access
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not permitted")
+
+    version = task_version(row)
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    task = db.scalars(_task_detail_stmt(task_id)).first()
     if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    # Admin can always access
-    if current_user.role.name == 'admin':
-        return task
-
-    # Check if user is the assignee
-    if task.assignee_id == current_user.id:
-        return task
+        raise _task_not_found()
+    set_version_headers(response, version)
+    return task
 
-    # Check if user is member of the project
-    project = db.query(models.Project).filter(models.Project.id == task.project_id).first()
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+# -----------------------------
+# List Tasks (all or by project)
+# -----------------------------
+def _task_list_stmt(project_id: Optional[int], current_user, params: TaskListParams):
+    stmt = select(models.Task)
+    if project_id:
+        stmt = stmt.where(models.Task.project_id == project_id)
 
-    # Assuming project.members is list of User objects
-    project_member_ids = [member.id for member in project.members]
+    # Developers see only their tasks
+    if current_user.role.name == 'developer':
+        stmt = stmt.where(models.Task.assignee_id == current_user.id)
 
-    if current_user.id in project_member_ids:
-        return task
+    return apply_task_list_params(stmt, params)
 
-    # Otherwise forbid access
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not permitted")
+async def list_tasks_async(
+    request: Request,
+    project_id: Optional[int] = None,
+    params: TaskListParams = Depends(task_list_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    stmt = _task_list_stmt(project_id, current_user, params)
+    return await task_page_async(db, request, stmt, params, current_user.id)
 
-# -----------------------------
-# List Tasks (all or by project)
-# -----------------------------
-@router.get("/")
+@router.get("/", response_model=list[schemas.TaskOut])
+@use_async_variant(list_tasks_async)
 def list_tasks(
+    request: Request,
     project_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    params: TaskListParams = Depends(task_list_params),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    query = db.query(models.Task)
-    if project_id:
-        query = query.filter(models.Task.project_id == project_id)
-    
-    # Developers see only their tasks
-    if current_user.role.name == 'developer':
-        query = query.filter(models.Task.assignee_id == current_user.id)
-    
-    return query.all()
+    # Serialized with a precompiled list adapter; ?view=summary returns TaskSummary rows
+    stmt = _task_list_stmt(project_id, current_user, params)
+    return task_page(db, request, stmt, params, current_user.id)
 
 # -----------------------------
 # Update Task
@@ -167,9 +242,6 @@ def update_task(
         else:
             setattr(task, field, value)
 
-    db.commit()
-    db.refresh(task)
-
     # Log history if there were any changes
     if changes:
         log_task_history(
@@ -181,7 +253,9 @@ def update_task(
             description=f"Task updated by {current_user.name}"
         )
 
-    return task
+    db.commit()
+
+    return db.scalars(_task_detail_stmt(task.id)).one()
 
 
 # -----------------------------
@@ -208,8 +282,6 @@ def update_task_status(
     old_status = task.status
     if old_status != new_status:
         task.status = new_status
-        db.commit()
-        db.refresh(task)
 
         log_task_history(
             db=db,
@@ -222,6 +294,9 @@ def update_task_status(
             description=f"Status changed from '{old_status}' to '{new_status}' by {current_user.name}"
         )
 
+        db.commit()
+        db.refresh(task)
+
     return {"ok": True, "status": task.status}
 
 
@@ -248,8 +323,6 @@ def update_task_deadline(
 
     old_value = str(task.due_date)
     task.due_date = due_date
-    db.commit()
-    db.refresh(task)
 
     log_task_history(
         db=db,
@@ -262,6 +335,9 @@ def update_task_deadline(
         description=f"Deadline updated by {current_user.name}"
     )
 
+    db.commit()
+    db.refresh(task)
+
     return {"ok": True, "task_id": task.id, "due_date": task.due_date}
 
 # -----------------------------
@@ -283,7 +359,6 @@ def delete_task(
     project = task.project  # get the associated project before deletion
 
     db.delete(task)
-    db.commit()
 
     # Log project history
     if project:
@@ -298,23 +373,73 @@ def delete_task(
             description=f"{current_user.name} deleted task '{task.title}'"
         )
 
+    db.commit()
+
     return {"ok": True, "message": "Task deleted successfully"}
 
 
-def get_task_history(db: Session, task_id: int):
-    return (
-        db.query(models.TaskHistory)
-        .filter(models.TaskHistory.task_id == task_id)
-        .order_by(models.TaskHistory.created_at.desc())
-        .all()
-    )
+def _task_history_stmts(task_id: int, limit: int, cursor=None, action=None, field=None):
+    # Hot table + archive tier (see app/services/history_archiver.py).
+    # Each tier is keyset-paged on (created_at, id); limit + 1 rows per tier
+    # is enough to fill the merged page and know whether there is a next one.
+    stmts = []
+    for model in (models.TaskHistory, models.TaskHistoryArchive):
+        stmt = (
+            select(model)
+            .options(selectinload(model.user))
+            .where(model.task_id == task_id)
+        )
+        if action is not None:
+            stmt = stmt.where(model.action == action)
+        if field:
+            stmt = stmt.where(model.field_name == field)
+        after = keyset_after(model.created_at, model.id, cursor)
+        if after is not None:
+            stmt = stmt.where(after)
+        stmts.append(stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1))
+    return stmts
+
+def get_task_history(db: Session, task_id: int, limit: int = 50, cursor=None, action=None, field=None):
+    hot, cold = (db.scalars(stmt).all() for stmt in _task_history_stmts(task_id, limit, cursor, action, field))
+    return page_tiers(hot, cold, "created_at", limit)
+
+async def get_task_history_async(
+    task_id: int,
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    action: Optional[models.HistoryAction] = None,
+    field: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    version = history_version("task_history", task_id, (await db.execute(task_history_version_stmt(task_id))).one())
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    stmts = _task_history_stmts(task_id, limit, decode_cursor(cursor, 2), action, field)
+    hot, cold = [(await db.scalars(stmt)).all() for stmt in stmts]
+    history, next_cursor = page_tiers(hot, cold, "created_at", limit)
+    return set_version_headers(adapter_response(schemas.task_history_list_adapter, history, next_cursor), version)
 
 @router.get("/{task_id}/history", response_model=list[schemas.TaskHistoryResponse])
+@use_async_variant(get_task_history_async)
 def get_task_history_endpoint(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    action: Optional[models.HistoryAction] = None,
+    field: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    # Optional: check if user can view the task
-    history = get_task_history(db, task_id)
-    return history
+    # Newest first; pass the X-Next-Cursor header back as ?cursor= for older entries
+    version = history_version("task_history", task_id, db.execute(task_history_version_stmt(task_id)).one())
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+
+    history, next_cursor = get_task_history(db, task_id, limit, decode_cursor(cursor, 2), action, field)
+    return set_version_headers(adapter_response(schemas.task_history_list_adapter, history, next_cursor), version)
@@ -4,7 +4,7 @@ from datetime import datetime
 from app.db import models, schemas
 from app.db.database import get_db
 from app.utils.time_log_utils import create_time_log
-from app.deps import get_current_user
+from app.deps import get_current_user, get_current_principal, Principal
 
 router = APIRouter(prefix="/timelogs", tags=["Time Logs"])
 
@@ -31,7 +31,7 @@ def log_time(task_id: int, log_in: schemas.TimeLogCreate,
 @router.get("/tasks/{task_id}", response_model=list[schemas.TimeLogOut])
 def get_task_time_logs(task_id: int, 
                        db: Session = Depends(get_db), 
-                       current_user: models.User = Depends(get_current_user)):
+                       current_user: Principal = Depends(get_current_principal)):
     task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
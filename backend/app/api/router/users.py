@@ -1,11 +1,18 @@
 import shutil
 from typing import Optional
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from app.db import models, schemas
 from app.db.database import get_db
-from app.deps import get_current_user
-from app.services.tasks_service import get_tasks_for_user
+from app.db.replicas import get_read_db
+from app.deps import get_current_user, get_current_principal, Principal
+from app.services.tasks_service import (
+    TaskListParams, apply_task_list_params, get_tasks_for_user, task_list_params, task_page,
+)
+from app.security.principal_cache import invalidate_user
+from app.utils.projections import View
+from app.utils.responses import adapter_response
 
 
 router = APIRouter()
@@ -17,32 +24,47 @@ def read_own_profile(current_user:models.User=Depends(get_current_user)):
 
 @router.get('/', response_model=list[schemas.UserOut])
 def list_users(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    view: View = "full",
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     # ✅ Admin can see everyone
     if current_user.role.name.lower() == 'admin':
-        return db.query(models.User).all()
+        stmt = select(models.User)
 
     # ✅ Manager can see only developers
-    if current_user.role.name.lower() == 'manager':
-        return (
-            db.query(models.User)
+    elif current_user.role.name.lower() == 'manager':
+        stmt = (
+            select(models.User)
             .join(models.Role)
-            .filter(models.Role.name == 'developer')
-            .all()
+            .where(models.Role.name == 'developer')
         )
 
     # ❌ Developers and others cannot view users
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail='Not enough privileges'
-    )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Not enough privileges'
+        )
+
+    # ?view=summary: UserSummary rows (role name instead of nested role / creator)
+    if view == "summary":
+        stmt = stmt.with_only_columns(
+            models.User.id, models.User.name, models.User.email, models.User.avatar,
+            models.User.is_active, models.Role.name.label("role_name"),
+        )
+        if current_user.role.name.lower() == 'admin':
+            stmt = stmt.outerjoin(models.Role, models.User.role_id == models.Role.id)
+        return adapter_response(schemas.user_summaries_adapter, db.execute(stmt).all())
+
+    return db.scalars(
+        stmt.options(selectinload(models.User.role), selectinload(models.User.creator))
+    ).all()
 
 
 # GET user by id (admin)
 @router.get('/{user_id}', response_model=schemas.UserOut)
-def get_user(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_user(user_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     if not current_user.role or current_user.role.name == 'developer':
         raise HTTPException(status_code=403, detail='Not enough privileges')
     user = db.query(models.User).filter(models.User.id == user_id).first()
@@ -56,6 +78,7 @@ def update_own_profile(payload: schemas.UserUpdate, db: Session = Depends(get_db
     if payload.name: current_user.name = payload.name
     if payload.email: current_user.email = payload.email
     db.commit(); db.refresh(current_user)
+    invalidate_user(current_user.id)
     return current_user
 
 
@@ -75,17 +98,30 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    invalidate_user(user_id)
     return {"detail": "User deleted successfully"}
 
 
 @router.get("/{user_id}/tasks", response_model=list[schemas.TaskDetails])
-def user_tasks(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    query = get_tasks_for_user(db, user_id, current_user)
-    return query.all()
+def user_tasks(
+    user_id: int,
+    request: Request,
+    params: TaskListParams = Depends(task_list_params),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    stmt = apply_task_list_params(get_tasks_for_user(db, user_id, current_user), params)
+    return task_page(db, request, stmt, params, current_user.id, with_project=True)
 
 
 @router.get("/{user_id}/assigned-tasks", response_model=list[schemas.TaskDetails])
-def user_assigned_tasks(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def user_assigned_tasks(
+    user_id: int,
+    request: Request,
+    params: TaskListParams = Depends(task_list_params),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
     role = current_user.role.name.lower()
     if role == "developer":
         raise HTTPException(
@@ -93,11 +129,12 @@ def user_assigned_tasks(user_id: int, db: Session = Depends(get_db), current_use
             detail="Not enough privileges"
         )
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return db.query(models.Task).filter(models.Task.assignee_id == user_id).all()
+    stmt = apply_task_list_params(select(models.Task).where(models.Task.assignee_id == user_id), params)
+    return task_page(db, request, stmt, params, current_user.id, with_project=True)
 
 
 @router.patch("/{user_id}/toggle-activation", response_model=schemas.UserOut)
@@ -135,6 +172,7 @@ def toggle_user_activation(
     user.is_active = not user.is_active
     db.commit()
     db.refresh(user)
+    invalidate_user(user.id)
 
     return user
 
@@ -169,6 +207,7 @@ async def upload_avatar(
     user.avatar = f"/static/avatars/{file_name}"
     db.commit()
     db.refresh(user)
+    invalidate_user(user.id)
 
     return {"avatar_url": user.avatar}
 
@@ -206,5 +245,6 @@ async def delete_avatar(
     user.avatar = None
     db.commit()
     db.refresh(user)
+    invalidate_user(user.id)
 
     return {"detail": "Avatar removed successfully", "avatar_url": None}
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # 🔐 Security
@@ -10,6 +10,27 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # "sync" (threadpool handlers) or "async" (hot read routes on an async engine)
+    DB_MODE: str = "sync"
+    # Defaults to DATABASE_URL with an async driver (aiomysql / aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # 📚 Read replicas (comma-separated URLs) for GET routes
+    DATABASE_REPLICA_URLS: str = ""
+    # After a write, that user's reads stay on the primary for this long
+    REPLICA_STICKY_SECONDS: int = 10
+    # How long a failed replica is skipped before it is pinged again
+    REPLICA_RETRY_SECONDS: int = 30
+    # Background ping of every replica (0 disables; failures are then only seen on use)
+    REPLICA_HEALTH_CHECK_SECONDS: int = 10
+
+    # 🏊 Connection pool (size it per worker against the DB's max_connections)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; keep below MySQL's wait_timeout
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 0  # connections opened at startup
 
     # Project
     PROJECT_NAME: str
@@ -18,6 +39,42 @@ class Settings(BaseSettings):
     # Default password
     DEFAULT_USER_PASSWORD: str
 
+    # 👤 Principal cache (authenticated user + role, per worker)
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # 🎫 Claims-based auth: authorize read routes from the verified JWT
+    # (user id, role, token version) instead of loading the User row
+    AUTH_CLAIMS_MODE: bool = False
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 30
+
+    # 🔑 Password hashing executor (bcrypt runs off the request threads)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_USE_PROCESSES: bool = False
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # 🕓 Write-behind history: task/project history rows are queued after
+    # commit and inserted in batches by a background worker
+    HISTORY_WRITE_BEHIND: bool = False
+    HISTORY_QUEUE_SIZE: int = 10000
+    HISTORY_FLUSH_INTERVAL_MS: int = 200
+    HISTORY_BATCH_SIZE: int = 500
+
+    # 🧊 History archival: rows older than N days move to *_archive tables
+    HISTORY_ARCHIVE_ENABLED: bool = False
+    HISTORY_ARCHIVE_AFTER_DAYS: int = 180
+    HISTORY_ARCHIVE_BATCH_SIZE: int = 1000
+    HISTORY_ARCHIVE_INTERVAL_MINUTES: int = 60
+    # Collapse runs of consecutive edits of a task by the same user into one row
+    HISTORY_ARCHIVE_COMPACT: bool = False
+
+    # 📉 Daily project rollups (burndown / cumulative flow)
+    ROLLUP_ENABLED: bool = False
+    ROLLUP_INTERVAL_MINUTES: int = 60
+
+    # 📤 Exports: rows per keyset page (one query each)
+    EXPORT_BATCH_SIZE: int = 1000
+
     # 🌐 CORS
     ALLOWED_ORIGINS: str
 
@@ -26,6 +83,10 @@ class Settings(BaseSettings):
         # Split comma-separated origins into a list
         return [origin.strip() for origin in v.split(",")] if v else []
 
+    @field_validator("DATABASE_REPLICA_URLS")
+    def parse_replica_urls(cls, v: str) -> List[str]:
+        return [url.strip() for url in v.split(",") if url.strip()] if v else []
+
     class Config:
         env_file = ".env"  # Load environment variables from .env
         env_file_encoding = "utf-8"
@@ -1,17 +1,151 @@
 # app/db/database.py
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings  # Make sure settings.DATABASE_URL exists
 
 Base = declarative_base()
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return record
+
+
+def _engine_kwargs(url: str) -> dict:
+    # SQLite (local scripts / tests) manages its own pool
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, echo=False, **_engine_kwargs(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Connections dropped as stale by pre-ping / recycle
+_invalidated = 0
+
+@event.listens_for(engine, "invalidate")
+def _count_invalidated(dbapi_connection, connection_record, exception):
+    global _invalidated
+    _invalidated += 1
+
+
+def warm_up_pool(count: int = settings.DB_POOL_WARMUP) -> int:
+    """Open `count` connections up front so the first requests don't pay for the handshake."""
+    count = min(count, settings.DB_POOL_SIZE)
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status(), "invalidated": _invalidated}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "timeout": settings.DB_POOL_TIMEOUT,
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            stats.update({
+                "checkouts": pool.checkouts,
+                "timeouts": pool.timeouts,
+                "avg_wait_ms": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+                "max_wait_ms": round(pool.max_wait * 1000, 3),
+            })
+    return stats
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# ---------------------------
+# Async engine (DB_MODE=async)
+# ---------------------------
+def _async_url(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    if scheme.startswith("mysql"):
+        return f"mysql+aiomysql://{rest}"
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_MODE == "async":
+    # Imported only when enabled so sync deployments don't need an async driver
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    _url = settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL)
+    _async_kwargs = {k: v for k, v in _engine_kwargs(_url).items() if k != "poolclass"}
+    async_engine = create_async_engine(_url, echo=False, **_async_kwargs)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is not configured (set DB_MODE=async)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def use_async_variant(async_handler):
+    """
+    Route decorator: register `async_handler` instead of the decorated sync
+    handler when DB_MODE=async. Place it *below* the @router.get(...) line.
+    """
+    def decorator(sync_handler):
+        return async_handler if settings.DB_MODE == "async" else sync_handler
+    return decorator
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Boolean, Table, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, Enum, Boolean, Table, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -8,8 +8,10 @@ import enum
 project_members = Table(
     'project_members',
     Base.metadata,
-    Column('project_id', Integer, ForeignKey('projects.id', ondelete='CASCADE')),
-    Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'))
+    Column('project_id', Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    # user -> projects lookups (the PK covers project -> users)
+    Index('ix_project_members_user_project', 'user_id', 'project_id'),
 )
 
 # Enum for task status
@@ -56,6 +58,7 @@ class User(Base):
     role_id = Column(Integer, ForeignKey('roles.id'))
     is_active = Column(Boolean, default=True)
     avatar = Column(String(255), nullable=True)  # store avatar URL or path
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped to revoke issued JWTs
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     created_by_id = Column(Integer, ForeignKey('users.id'), nullable=True)  # nullable for first admin
 
@@ -106,8 +109,15 @@ class Project(Base):
     @property
     def member_ids(self) -> list[int]:
         """Return a list of member IDs for this project."""
+        # Listings preload the ids (see app/services/projects_service.py)
+        preloaded = self.__dict__.get("_member_ids")
+        if preloaded is not None:
+            return preloaded
         return [member.id for member in self.members]
 
+    def preload_member_ids(self, member_ids: list[int]) -> None:
+        self.__dict__["_member_ids"] = member_ids
+
 
 class ProjectHistory(Base):
     __tablename__ = "project_history"
@@ -128,6 +138,34 @@ class ProjectHistory(Base):
     user = relationship("User")
     project = relationship("Project")
 
+    __table_args__ = (
+        Index('ix_project_history_project_timestamp', 'project_id', 'timestamp'),
+    )
+
+
+# Cold tier: project history older than HISTORY_ARCHIVE_AFTER_DAYS (same columns, ids preserved)
+class ProjectHistoryArchive(Base):
+    __tablename__ = "project_history_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    action = Column(String(255), nullable=False)
+    field = Column(String(255), nullable=True)
+    old_value = Column(String(500), nullable=True)
+    new_value = Column(String(500), nullable=True)
+
+    changes = Column(JSON, nullable=True, comment="JSON object of all changes")
+    description = Column(Text, nullable=True, comment="Human readable description")
+    timestamp = Column(DateTime(timezone=True))
+
+    user = relationship("User")
+
+    __table_args__ = (
+        Index('ix_project_history_archive_project_timestamp', 'project_id', 'timestamp'),
+    )
+
 
 # Task model
 class Task(Base):
@@ -164,6 +202,61 @@ class Task(Base):
     time_logs = relationship('TimeLog', back_populates='task', cascade='all, delete-orphan')
     history = relationship('TaskHistory', back_populates='task', cascade='all, delete-orphan', order_by='TaskHistory.created_at.desc()')
 
+    __table_args__ = (
+        Index('ix_tasks_project_status', 'project_id', 'status'),
+        Index('ix_tasks_assignee_id', 'assignee_id'),
+        Index('ix_tasks_due_date_status', 'due_date', 'status'),  # overdue reports
+        Index('ix_tasks_created_at', 'created_at'),  # list sort / cursor
+        Index('ix_tasks_updated_at', 'updated_at'),  # list sort / updated_since
+    )
+
+
+# Per-project task counters, kept in step with tasks by the flush listener
+# in app/services/project_stats.py (scripts/rebuild_project_stats.py repairs drift)
+class ProjectStats(Base):
+    __tablename__ = 'project_stats'
+
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    todo = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    in_review = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    estimated_hours = Column(Float, nullable=False, default=0.0)
+    actual_hours = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# One row per project per day (UTC), written by app/services/rollups.py;
+# burndown and cumulative-flow charts read only these rows
+class ProjectDailyStats(Base):
+    __tablename__ = 'project_daily_stats'
+
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    todo = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    in_review = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    remaining_hours = Column(Float, nullable=False, default=0.0, comment="Estimated hours of tasks not done")
+    hours_logged = Column(Float, nullable=False, default=0.0, comment="Time logged that day")
+
+
+# Hours logged per ISO week (Monday), project and user; rewritten by the
+# rollup job for fast repeated timesheet reads (app/services/timesheets.py)
+class WeeklyHours(Base):
+    __tablename__ = 'weekly_hours'
+
+    week_start = Column(Date, primary_key=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    hours = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index('ix_weekly_hours_user_week', 'user_id', 'week_start'),
+        Index('ix_weekly_hours_project_week', 'project_id', 'week_start'),
+    )
+
 
 # Time Log model
 class TimeLog(Base):
@@ -183,6 +276,10 @@ class TimeLog(Base):
     task = relationship('Task', back_populates='time_logs')
     user = relationship('User', back_populates='time_logs')
 
+    __table_args__ = (
+        Index('ix_time_logs_task_log_date', 'task_id', 'log_date'),
+    )
+
 
 # Task History model
 class TaskHistory(Base):
@@ -205,6 +302,34 @@ class TaskHistory(Base):
     task = relationship('Task', back_populates='history')
     user = relationship('User', back_populates='task_history')
 
+    __table_args__ = (
+        Index('ix_task_history_task_created_at', 'task_id', 'created_at'),
+    )
+
+
+# Cold tier: task history older than HISTORY_ARCHIVE_AFTER_DAYS (same columns, ids preserved;
+# optionally compacted, see app/services/history_archiver.py)
+class TaskHistoryArchive(Base):
+    __tablename__ = 'task_history_archive'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    action = Column(Enum(HistoryAction), nullable=False)
+    field_name = Column(String(100), nullable=True, comment="Field that was changed")
+    old_value = Column(Text, nullable=True, comment="Previous value")
+    new_value = Column(Text, nullable=True, comment="New value")
+    changes = Column(JSON, nullable=True, comment="JSON object of all changes")
+    description = Column(Text, nullable=True, comment="Human readable description")
+    created_at = Column(DateTime(timezone=True))
+
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+
+    user = relationship('User')
+
+    __table_args__ = (
+        Index('ix_task_history_archive_task_created_at', 'task_id', 'created_at'),
+    )
+
 
 # Comment model
 class Comment(Base):
@@ -214,7 +339,7 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'))
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), index=True)
     author_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'))
 
     task = relationship('Task', back_populates='comments')
@@ -0,0 +1,279 @@
+# app/db/replicas.py
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.database import SessionLocal, AsyncSessionLocal, _async_url, _engine_kwargs
+from app.security.jwt import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_COOKIE = "pm_last_write"
+# Same timestamp as the cookie, for cross-origin clients that don't send
+# cookies: the SPA stores it and echoes it back on every request
+LAST_WRITE_HEADER = "X-Last-Write"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, echo=False, **_engine_kwargs(url))
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.AsyncSessionLocal = None
+        if settings.DB_MODE == "async":
+            from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+            async_url = _async_url(url)
+            kwargs = {k: v for k, v in _engine_kwargs(async_url).items() if k != "poolclass"}
+            self.AsyncSessionLocal = async_sessionmaker(
+                create_async_engine(async_url, echo=False, **kwargs),
+                class_=AsyncSession, autoflush=False, expire_on_commit=False,
+            )
+        self.down_until = 0.0
+        self.failures = 0
+        self.sessions = 0
+
+    def ping(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except DBAPIError:
+            return False
+
+
+class ReplicaRouter:
+    """
+    Round-robin over the configured replicas, skipping any replica that
+    failed in the last REPLICA_RETRY_SECONDS. A skipped replica is pinged
+    again (once) before it is handed out; pick_async() runs that ping in
+    the threadpool so a dead replica never blocks the event loop.
+
+    With the health probe running (start()), every replica is also pinged
+    every REPLICA_HEALTH_CHECK_SECONDS, so a dead replica is taken out
+    before a request lands on it and a recovered one comes back without
+    waiting for the retry window. Requests then rely on the probe's state
+    and never ping inline.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        self.primary_fallbacks = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_probe: Optional[float] = None
+
+    @property
+    def probing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _candidates(self):
+        """Replicas in round-robin order whose retry window has passed."""
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = next(self._cycle)
+            if replica.down_until <= time.monotonic():
+                yield replica
+
+    def _hand_out(self, replica: Replica) -> Replica:
+        replica.failures = 0
+        replica.sessions += 1
+        return replica
+
+    def _fallback(self) -> None:
+        with self._lock:
+            self.primary_fallbacks += 1
+        return None
+
+    def pick(self) -> Optional[Replica]:
+        if not self.replicas:
+            return None
+        for replica in self._candidates():
+            # While the probe runs its health state is current: no inline ping
+            if replica.failures == 0 or self.probing or replica.ping():
+                return self._hand_out(replica)
+            self.mark_down(replica)
+        return self._fallback()
+
+    async def pick_async(self) -> Optional[Replica]:
+        """pick() for coroutines: a needed ping runs in the threadpool, never on the event loop."""
+        if not self.replicas:
+            return None
+        for replica in self._candidates():
+            if replica.failures == 0 or self.probing or await run_in_threadpool(replica.ping):
+                return self._hand_out(replica)
+            self.mark_down(replica)
+        return self._fallback()
+
+    def mark_down(self, replica: Replica) -> None:
+        replica.failures += 1
+        replica.down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+    def mark_up(self, replica: Replica) -> None:
+        replica.failures = 0
+        replica.down_until = 0.0
+
+    # ---- active health probe ----
+    def probe(self) -> None:
+        for replica in self.replicas:
+            if replica.ping():
+                self.mark_up(replica)
+            else:
+                if replica.down_until <= time.monotonic():
+                    logger.warning("Replica %s failed its health check", replica.engine.url.render_as_string(hide_password=True))
+                self.mark_down(replica)
+        self.last_probe = time.monotonic()
+
+    def start(self, interval_seconds: int) -> None:
+        if self._thread is not None or not self.replicas or interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds,), name="replica-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval_seconds: int) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.probe()
+            except Exception:
+                logger.exception("Replica health probe failed")
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {
+                    "url": r.engine.url.render_as_string(hide_password=True),
+                    "healthy": r.down_until <= now,
+                    "failures": r.failures,
+                    "sessions": r.sessions,
+                }
+                for r in self.replicas
+            ],
+            "primary_fallbacks": self.primary_fallbacks,
+            "last_probe_seconds_ago": round(now - self.last_probe, 1) if self.last_probe is not None else None,
+            "sticky_users": len(write_tracker._last_write),
+        }
+
+
+class WriteTracker:
+    """Remembers (per worker) when each user last wrote, for read-your-writes."""
+
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+        self._last_write: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            # Drop users whose window has passed so the map stays small
+            if len(self._last_write) > 10000:
+                cutoff = now - self.window_seconds
+                self._last_write = {k: v for k, v in self._last_write.items() if v > cutoff}
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            last = self._last_write.get(user_id)
+        return last is not None and time.monotonic() - last < self.window_seconds
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+write_tracker = WriteTracker(settings.REPLICA_STICKY_SECONDS)
+
+
+def _user_id_from_request(request: Request) -> Optional[int]:
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return decode_access_token(auth[7:]).get("user_id")
+    except Exception:
+        return None
+
+
+def _recent(stamp: Optional[str]) -> bool:
+    if not stamp:
+        return False
+    try:
+        return time.time() - float(stamp) < settings.REPLICA_STICKY_SECONDS
+    except ValueError:
+        return False
+
+
+def must_read_primary(request: Request) -> bool:
+    # The header / cookie cover writes handled by another worker
+    if _recent(request.headers.get(LAST_WRITE_HEADER)) or _recent(request.cookies.get(LAST_WRITE_COOKIE)):
+        return True
+    return write_tracker.is_sticky(getattr(request.state, "user_id", None))
+
+
+async def track_writes(request: Request, call_next):
+    """HTTP middleware: pin a user's reads to the primary right after they write."""
+    request.state.user_id = _user_id_from_request(request)
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        if request.state.user_id is not None:
+            write_tracker.record(request.state.user_id)
+        stamp = str(time.time())
+        response.headers[LAST_WRITE_HEADER] = stamp
+        response.set_cookie(
+            LAST_WRITE_COOKIE, stamp,
+            max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite="lax",
+        )
+    return response
+
+
+# ---------------------------
+# Session dependencies for read-only routes
+# ---------------------------
+def read_session_factory(request: Request):
+    """Sessionmaker for reads that outlive the request dependency (streamed responses)."""
+    replica = None if must_read_primary(request) else replica_router.pick()
+    return replica.SessionLocal if replica else SessionLocal
+
+
+def get_read_db(request: Request):
+    replica = None if must_read_primary(request) else replica_router.pick()
+    db = (replica.SessionLocal if replica else SessionLocal)()
+    try:
+        yield db
+    except DBAPIError as exc:
+        if replica is not None and (exc.connection_invalidated or isinstance(exc, OperationalError)):
+            replica_router.mark_down(replica)
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    replica = None if must_read_primary(request) else await replica_router.pick_async()
+    factory = replica.AsyncSessionLocal if replica else AsyncSessionLocal
+    if factory is None:
+        raise RuntimeError("Async database is not configured (set DB_MODE=async)")
+    async with factory() as db:
+        try:
+            yield db
+        except DBAPIError as exc:
+            if replica is not None and (exc.connection_invalidated or isinstance(exc, OperationalError)):
+                replica_router.mark_down(replica)
+            raise
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, field_serializer, Field
+from pydantic import BaseModel, EmailStr, field_serializer, Field, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 import enum
@@ -55,6 +55,18 @@ class UserMini(BaseModel):
     class Config:
         from_attributes = True  # or from_attributes = True for Pydantic v1    
 
+# ?view=summary on user listings: plain columns, no nested objects
+class UserSummary(BaseModel):
+    id: int
+    name: str
+    email: str
+    avatar: Optional[str] = None
+    is_active: Optional[bool] = True
+    role_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 class UserTaskMember(UserMini):
     role: RoleOut
     class Config:
@@ -86,6 +98,17 @@ class ProjectOut(BaseModel):
     class Config:
         from_attributes = True  # ✅ Pydantic v2 equivalent of orm_mode
 
+# ?view=summary on project endpoints: no member ids, tasks or members
+class ProjectSummary(BaseModel):
+    id: int
+    title: str
+    description: Optional[str]
+    is_archived: Optional[bool] = False
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class ProjectMember(BaseModel):
     id: int
     name: str
@@ -136,6 +159,11 @@ class ProjectProgress(BaseModel):
     class Config:
         from_attributes = True  # <-- This enables from_orm in Pydantic v2
 
+# GET /projects/progress/batch
+class ProjectProgressBatch(ProjectProgress):
+    overdue_tasks: int
+    member_count: int
+
 class ProjectHistoryOut(BaseModel):
     id: int
     project_id: int
@@ -190,6 +218,21 @@ class TaskDetails(TaskOut):
     class Config:
         from_attributes = True
 
+# ?view=summary on task listings: ids instead of nested users / project
+class TaskSummary(BaseModel):
+    id: int
+    title: str
+    status: str
+    priority: Optional[TaskPriority] = None
+    due_date: Optional[datetime] = None
+    project_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class TaskUpdate(BaseModel):
     title: Optional[str]
     description: Optional[str]
@@ -251,3 +294,16 @@ class CommentOut(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str = 'bearer'
+
+# ------------------ Precompiled list serializers ------------------
+# Built once at import; used with app.utils.responses.adapter_response()
+# on the large list endpoints.
+task_out_list_adapter = TypeAdapter(List[TaskOut])
+task_details_list_adapter = TypeAdapter(List[TaskDetails])
+task_summary_adapter = TypeAdapter(List[TaskSummary])
+task_history_list_adapter = TypeAdapter(List[TaskHistoryResponse])
+project_history_list_adapter = TypeAdapter(List[ProjectHistoryOut])
+project_summary_adapter = TypeAdapter(ProjectSummary)
+project_summaries_adapter = TypeAdapter(List[ProjectSummary])
+user_summaries_adapter = TypeAdapter(List[UserSummary])
+comment_list_adapter = TypeAdapter(List[CommentOut])
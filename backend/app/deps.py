@@ -1,21 +1,133 @@
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
+from app.db.database import get_db, get_async_db
 from app.db import models
 from app.security.jwt import decode_access_token
+from app.security.principal_cache import principal_cache, token_version_cache, attach, detach
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/auth/token')
 
-def get_current_user(token:str=Depends(oauth2_scheme), db:Session=Depends(get_db)):
+
+@dataclass(frozen=True)
+class RoleClaim:
+    name: str
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller built from verified token claims only (no User row)."""
+    id: int
+    email: Optional[str]
+    role: RoleClaim
+    token_version: int
+
+
+def _decode(token:str) -> dict:
     try:
         payload=decode_access_token(token)
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate token')
-    user_id=payload.get('user_id')
-    if user_id is None:
+    if payload.get('user_id') is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate token')
-    user=db.query(models.User).filter(models.User.id==user_id).first()
+    return payload
+
+
+def get_current_user(token:str=Depends(oauth2_scheme), db:Session=Depends(get_db)):
+    payload=_decode(token)
+    user_id=payload['user_id']
+    token_version=payload.get('ver', 0)
+
+    # ⚡ Cached principal: no User / Role queries at all
+    cached=principal_cache.get(user_id, token)
+    if cached is not None:
+        if (cached.token_version or 0) != token_version:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token has been revoked')
+        return attach(db, cached)
+
+    user=(
+        db.query(models.User)
+        .options(joinedload(models.User.role))
+        .filter(models.User.id==user_id)
+        .first()
+    )
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='User not found')
-    return user
+    if (user.token_version or 0) != token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token has been revoked')
+    principal_cache.set(user_id, token, detach(db, user))
+    return attach(db, user)
+
+
+def _claims_principal(payload: dict) -> Principal:
+    return Principal(
+        id=payload['user_id'],
+        email=payload.get('email'),
+        role=RoleClaim(name=payload['role']),
+        token_version=payload.get('ver', 0),
+    )
+
+
+def _claims_payload(token:str) -> dict:
+    payload=_decode(token)
+    if not payload.get('role'):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate token')
+    return payload
+
+
+def get_current_principal(token:str=Depends(oauth2_scheme), db:Session=Depends(get_db)):
+    """
+    Caller identity for routes that only need `id` and `role.name`.
+
+    With AUTH_CLAIMS_MODE on, the role comes from the verified JWT and the
+    only check is a cached token-version lookup, so the request's session
+    usually never touches the database. Otherwise this is get_current_user.
+    """
+    if not settings.AUTH_CLAIMS_MODE:
+        return get_current_user(token, db)
+
+    payload=_claims_payload(token)
+    if not token_version_cache.is_current(db, payload['user_id'], payload.get('ver', 0)):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token has been revoked')
+    return _claims_principal(payload)
+
+
+# ---- async (DB_MODE=async) ----
+async def get_current_principal_async(token:str=Depends(oauth2_scheme), db:AsyncSession=Depends(get_async_db)):
+    """
+    get_current_principal for the async route variants: same checks, but the
+    token-version / user lookups run on an AsyncSession instead of holding a
+    threadpool worker and a sync connection.
+    """
+    if settings.AUTH_CLAIMS_MODE:
+        payload=_claims_payload(token)
+        if not await token_version_cache.is_current_async(db, payload['user_id'], payload.get('ver', 0)):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token has been revoked')
+        return _claims_principal(payload)
+
+    payload=_decode(token)
+    user_id=payload['user_id']
+    token_version=payload.get('ver', 0)
+    user=principal_cache.get(user_id, token)
+    if user is None:
+        user=(await db.execute(
+            select(models.User).options(joinedload(models.User.role)).where(models.User.id==user_id)
+        )).scalars().first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='User not found')
+        if (user.token_version or 0)==token_version:
+            principal_cache.set(user_id, token, detach(db.sync_session, user))
+    if (user.token_version or 0)!=token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token has been revoked')
+    # Plain values only: the async handlers never lazy-load from the principal
+    return Principal(
+        id=user.id,
+        email=user.email,
+        role=RoleClaim(name=user.role.name if user.role else None),
+        token_version=token_version,
+    )
@@ -1,31 +1,97 @@
 # app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.router import router as api_router
-from app.db import models
-from app.db.database import engine
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+# Importing this module has no side effects: no DB connection, no schema
+# checks, no routers. The app is built by create_app(), either explicitly
+# (`uvicorn --factory app.main:create_app`) or on first access of
+# `app.main.app` (`uvicorn app.main:app`).
+#
+# Schema changes go through Alembic (`alembic upgrade head`);
+# scripts/create_db.py is the explicit command for a throwaway database.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.db.database import warm_up_pool
+    from app.security.password import password_hasher
+    from app.utils.history_sink import history_sink
+    from app.services.history_archiver import history_archiver
+    from app.services.rollups import daily_rollup
+    from app.db.replicas import replica_router
+
+    # ---- startup ----
+    if settings.DB_POOL_WARMUP > 0:
+        await run_in_threadpool(warm_up_pool, settings.DB_POOL_WARMUP)
+    if settings.HISTORY_WRITE_BEHIND:
+        history_sink.start()
+    if settings.HISTORY_ARCHIVE_ENABLED:
+        history_archiver.start()
+    if settings.ROLLUP_ENABLED:
+        daily_rollup.start()
+    replica_router.start(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+    yield
+
+    # ---- shutdown ----
+    await run_in_threadpool(history_archiver.stop)
+    await run_in_threadpool(daily_rollup.stop)
+    await run_in_threadpool(replica_router.stop)
+    # Flush queued history before the worker exits
+    await run_in_threadpool(history_sink.stop)
+    password_hasher.shutdown()
+
+
+def create_app() -> FastAPI:
+    from app.api.router import router as api_router
+    from app.db.replicas import LAST_WRITE_HEADER, track_writes
+    from app.utils.pagination import NEXT_CURSOR_HEADER
+    from app.utils.responses import FastJSONResponse
+
+    app = FastAPI(
+        title="Project Management API",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,  # orjson encode
+    )
+
+    # CORS for React dev server
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, LAST_WRITE_HEADER, "ETag", "Last-Modified", "Content-Disposition"],
+    )
+
+    # Read-your-writes for replica routing (only needed when replicas are configured)
+    if settings.DATABASE_REPLICA_URLS:
+        app.middleware("http")(track_writes)
+
+    # Include your API router
+    app.include_router(api_router, prefix="/api")
 
-app = FastAPI(title="Project Management API", version="0.1.0")
+    app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# CORS for React dev server
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
 
-# Include your API router
-app.include_router(api_router, prefix="/api")
+    return app
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# ✅ Create all tables
-models.Base.metadata.create_all(bind=engine)
+_app = None
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+def __getattr__(name: str):
+    # Lazily build the ASGI app the first time `app.main.app` is looked up
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.core.config import settings
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Module-level so they can be pickled into a process pool
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded executor.
+
+    At most `max_workers` hashes run at once and at most `max_queue` wait
+    behind them; anything beyond that is rejected with 503 instead of piling
+    up on the request threads or the event loop.
+    """
+
+    def __init__(self, max_workers: int, use_processes: bool, max_queue: int):
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def _get_executor(self):
+        # Created lazily: importing the app must not fork worker processes
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    pool_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+                    kwargs = {} if self.use_processes else {"thread_name_prefix": "password-hash"}
+                    self._executor = pool_cls(max_workers=self.max_workers, **kwargs)
+        return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent password operations, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.submitted += 1
+
+        started = time.perf_counter()
+
+        def _done(_future):
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self.total_latency += elapsed
+                self.max_latency = max(self.max_latency, elapsed)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(_done)
+        return future
+
+    # Blocking variants, for sync (threadpool) handlers and scripts
+    def hash(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(_verify, plain_password, hashed_password).result()
+
+    # Awaitable variants, for async handlers: the event loop never runs bcrypt
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, plain_password, hashed_password))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "use_processes": self.use_processes,
+                "max_queue": self.max_queue,
+                "in_flight": min(self.pending, self.max_workers),
+                "queue_depth": max(0, self.pending - self.max_workers),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_latency_ms": round(self.total_latency / self.completed * 1000, 2) if self.completed else 0.0,
+                "max_latency_ms": round(self.max_latency * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+# Utility functions
+def hash_password(password: str) -> str:
+    return password_hasher.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return password_hasher.verify(plain_password, hashed_password)
@@ -0,0 +1,203 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import models
+
+
+class PrincipalCache:
+    """
+    Bounded, TTL-based, in-process cache of authenticated users.
+
+    Entries are keyed by (user_id, token) and hold a *detached* User with its
+    Role already loaded. Callers must re-attach them to their own session with
+    `attach()` so that no ORM instance is ever shared between requests.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, models.User]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int, token: str) -> Optional[models.User]:
+        key = (user_id, token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def set(self, user_id: int, token: str, user: models.User) -> None:
+        if self.maxsize <= 0:
+            return
+        key = (user_id, token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every cached token of a user."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == user_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _token_version_stmt(user_id: int):
+    return select(models.User.token_version, models.User.is_active).where(models.User.id == user_id)
+
+
+class TokenVersionCache:
+    """
+    Short-lived, in-process map of user_id -> (token_version, is_active).
+
+    Lets claims-based auth reject revoked tokens without loading the User row;
+    a miss costs one narrow primary-key lookup.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, int, bool]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, user_id: int) -> Optional[Tuple[int, bool]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+            return None
+
+    def _store(self, user_id: int, row) -> Optional[Tuple[int, bool]]:
+        if row is None:
+            return None
+        version, is_active = row.token_version or 0, bool(row.is_active)
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, version, is_active)
+        return version, is_active
+
+    @staticmethod
+    def _matches(state: Optional[Tuple[int, bool]], token_version: int) -> bool:
+        if state is None:
+            return False
+        version, is_active = state
+        return is_active and version == token_version
+
+    def lookup(self, db: Session, user_id: int) -> Optional[Tuple[int, bool]]:
+        state = self._cached(user_id)
+        if state is not None:
+            return state
+        return self._store(user_id, db.execute(_token_version_stmt(user_id)).first())
+
+    def is_current(self, db: Session, user_id: int, token_version: int) -> bool:
+        return self._matches(self.lookup(db, user_id), token_version)
+
+    # ---- async (AsyncSession) ----
+    async def lookup_async(self, db: AsyncSession, user_id: int) -> Optional[Tuple[int, bool]]:
+        state = self._cached(user_id)
+        if state is not None:
+            return state
+        return self._store(user_id, (await db.execute(_token_version_stmt(user_id))).first())
+
+    async def is_current_async(self, db: AsyncSession, user_id: int, token_version: int) -> bool:
+        return self._matches(await self.lookup_async(db, user_id), token_version)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+token_version_cache = TokenVersionCache(ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS)
+
+
+def detach(db: Session, user: models.User) -> models.User:
+    """Remove a freshly loaded user (and its role) from the session so it can be cached."""
+    db.expunge(user)
+    if user.role is not None and user.role in db:
+        db.expunge(user.role)
+    return user
+
+
+def attach(db: Session, user: models.User) -> models.User:
+    """Copy a cached user into the request session without hitting the database."""
+    return db.merge(user, load=False)
+
+
+def invalidate_user(user_id: int) -> None:
+    principal_cache.invalidate(user_id)
+    token_version_cache.invalidate(user_id)
+
+
+# Fields whose change must revoke every token already issued to the user
+_REVOKING_FIELDS = ("role_id", "is_active", "hashed_password")
+
+
+# Bumped in the same UPDATE as the change itself, whichever route
+# (or script) makes it.
+@event.listens_for(models.User, "before_update")
+def _bump_token_version(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if any(getattr(attrs, field).history.has_changes() for field in _REVOKING_FIELDS):
+        target.token_version = (target.token_version or 0) + 1
+
+
+@event.listens_for(models.User, "after_update")
+def _invalidate_on_revocation(mapper, connection, target):
+    if inspect(target).attrs.token_version.history.has_changes():
+        invalidate_user(target.id)
@@ -0,0 +1,77 @@
+from fastapi import HTTPException, status
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db import models
+
+# ─────────────────────────────
+#  Access checks
+# ─────────────────────────────
+# "Is user X a member of / assigned in project Y" as single-row EXISTS
+# lookups on project_members (primary key) and tasks (ix_tasks_assignee_id),
+# so permission checks never load members or tasks collections.
+# Each check is a statement builder with a sync and an async runner.
+
+def _member_exists(project_id: int, user_id: int):
+    pm = models.project_members
+    return exists().where(pm.c.project_id == project_id, pm.c.user_id == user_id)
+
+
+def _assignee_exists(project_id: int, user_id: int):
+    return exists().where(models.Task.project_id == project_id, models.Task.assignee_id == user_id)
+
+
+def is_member_stmt(project_id: int, user_id: int):
+    return select(_member_exists(project_id, user_id))
+
+
+def can_view_project_stmt(project_id: int, user_id: int):
+    # Members, plus anyone with a task assigned in the project
+    return select(or_(_member_exists(project_id, user_id), _assignee_exists(project_id, user_id)))
+
+
+def _project_exists_stmt(project_id: int):
+    return select(exists().where(models.Project.id == project_id))
+
+
+def _is_privileged(current_user) -> bool:
+    return current_user.role.name in ("admin", "manager")
+
+
+# ---- sync ----
+def is_project_member(db: Session, project_id: int, user_id: int) -> bool:
+    return bool(db.scalar(is_member_stmt(project_id, user_id)))
+
+
+def can_view_project(db: Session, project_id: int, user_id: int) -> bool:
+    return bool(db.scalar(can_view_project_stmt(project_id, user_id)))
+
+
+def require_project_view(db: Session, project_id: int, current_user) -> None:
+    """404 if the project does not exist, 403 if the caller may not see it."""
+    if _is_privileged(current_user):
+        if not db.scalar(_project_exists_stmt(project_id)):
+            raise HTTPException(status_code=404, detail='Project not found')
+        return
+    if can_view_project(db, project_id, current_user.id):
+        return
+    if not db.scalar(_project_exists_stmt(project_id)):
+        raise HTTPException(status_code=404, detail='Project not found')
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Not permitted')
+
+
+# ---- async ----
+async def is_project_member_async(db: AsyncSession, project_id: int, user_id: int) -> bool:
+    return bool(await db.scalar(is_member_stmt(project_id, user_id)))
+
+
+async def require_project_view_async(db: AsyncSession, project_id: int, current_user) -> None:
+    if _is_privileged(current_user):
+        if not await db.scalar(_project_exists_stmt(project_id)):
+            raise HTTPException(status_code=404, detail='Project not found')
+        return
+    if await db.scalar(can_view_project_stmt(project_id, current_user.id)):
+        return
+    if not await db.scalar(_project_exists_stmt(project_id)):
+        raise HTTPException(status_code=404, detail='Project not found')
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Not permitted')
@@ -0,0 +1,160 @@
+import csv
+import enum
+import io
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import models
+
+# ─────────────────────────────
+#  Streaming exports
+# ─────────────────────────────
+# Column-only SELECTs (no ORM objects), read in keyset pages on the primary
+# key (`WHERE id > :last ORDER BY id LIMIT n`) and encoded one page at a
+# time. Paging instead of yield_per keeps memory flat on any driver: the
+# deployment's mysql+mysqlconnector has no server-side cursors and buffers
+# the whole result on the client, whatever execution options say.
+#
+# Every statement selects its table's primary key first; stream_export
+# pages on that column. Each page is an index range scan, so the first
+# rows go out without sorting the table. History exports the archive tier
+# before the hot tier, which keeps the output chronological.
+TASK_COLUMNS = (
+    models.Task.id, models.Task.project_id, models.Task.title, models.Task.status, models.Task.priority,
+    models.Task.assignee_id, models.Task.created_by, models.Task.due_date,
+    models.Task.estimated_hours, models.Task.actual_hours, models.Task.created_at, models.Task.updated_at,
+)
+
+TIME_LOG_COLUMNS = (
+    models.TimeLog.id, models.TimeLog.task_id, models.Task.project_id, models.TimeLog.user_id,
+    models.TimeLog.hours, models.TimeLog.log_date, models.TimeLog.description, models.TimeLog.created_at,
+)
+
+
+def _history_columns(model, field, at, *owner):
+    return (
+        model.id, *owner, model.user_id, model.action, field,
+        model.old_value, model.new_value, model.changes, model.description, at,
+    )
+
+
+def _in_range(column, since: Optional[datetime], until: Optional[datetime]) -> list:
+    clauses = []
+    if since is not None:
+        clauses.append(column >= since)
+    if until is not None:
+        clauses.append(column < until)
+    return clauses
+
+
+def _scoped(stmt, project_column, project_id: Optional[int], visible_project_ids):
+    if project_id is not None:
+        stmt = stmt.where(project_column == project_id)
+    if visible_project_ids is not None:
+        stmt = stmt.where(project_column.in_(visible_project_ids))
+    return stmt
+
+
+# ---- statements (one per tier for history: archive first, then hot; primary key first) ----
+def task_export_stmts(project_id=None, since=None, until=None, visible_project_ids=None) -> List:
+    stmt = select(*TASK_COLUMNS).where(*_in_range(models.Task.created_at, since, until))
+    return [_scoped(stmt, models.Task.project_id, project_id, visible_project_ids)]
+
+
+def time_log_export_stmts(project_id=None, since=None, until=None, visible_project_ids=None) -> List:
+    stmt = (
+        select(*TIME_LOG_COLUMNS)
+        .join(models.Task, models.Task.id == models.TimeLog.task_id)
+        .where(*_in_range(models.TimeLog.log_date, since, until))
+    )
+    return [_scoped(stmt, models.Task.project_id, project_id, visible_project_ids)]
+
+
+def task_history_export_stmts(project_id=None, since=None, until=None, visible_project_ids=None) -> List:
+    stmts = []
+    for model in (models.TaskHistoryArchive, models.TaskHistory):
+        stmt = (
+            select(*_history_columns(model, model.field_name, model.created_at, model.task_id, models.Task.project_id))
+            .join(models.Task, models.Task.id == model.task_id)
+            .where(*_in_range(model.created_at, since, until))
+        )
+        stmts.append(_scoped(stmt, models.Task.project_id, project_id, visible_project_ids))
+    return stmts
+
+
+def project_history_export_stmts(project_id=None, since=None, until=None, visible_project_ids=None) -> List:
+    stmts = []
+    for model in (models.ProjectHistoryArchive, models.ProjectHistory):
+        stmt = select(*_history_columns(model, model.field, model.timestamp, model.project_id)).where(*_in_range(model.timestamp, since, until))
+        stmts.append(_scoped(stmt, model.project_id, project_id, visible_project_ids))
+    return stmts
+
+
+# ---- encoders ----
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def _encode_csv() -> Callable:
+    def encode(rows) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_csv_value(v) for v in row])
+        return buffer.getvalue().encode()
+    return encode
+
+
+def _encode_ndjson(columns: List[str]) -> Callable:
+    def encode(rows) -> bytes:
+        return b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    return encode
+
+
+def keyset_pages(db: Session, stmt, batch_size: int) -> Iterator[list]:
+    """Pages of `stmt` in order of its first column (a unique key)."""
+    key = stmt.selected_columns[0]
+    last = None
+    while True:
+        page_stmt = stmt if last is None else stmt.where(key > last)
+        page = db.execute(page_stmt.order_by(key).limit(batch_size)).all()
+        if page:
+            yield page
+        if len(page) < batch_size:
+            return
+        last = page[-1][0]
+
+
+def stream_export(session_factory, stmts: List, fmt: str) -> Iterator[bytes]:
+    """
+    Generator for a StreamingResponse. Opens its own Session so it does not
+    depend on the request's dependency lifetime; its single transaction
+    gives every page the same snapshot on MySQL (REPEATABLE READ).
+    """
+    columns = [c.key for c in stmts[0].selected_columns]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue().encode()  # first byte before the query runs
+        encode = _encode_csv()
+    else:
+        encode = _encode_ndjson(columns)
+
+    db: Session = session_factory()
+    try:
+        for stmt in stmts:
+            for page in keyset_pages(db, stmt, settings.EXPORT_BATCH_SIZE):
+                yield encode(page)
+    finally:
+        db.close()
@@ -0,0 +1,170 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import models
+from app.utils.pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+
+def _field_changes(row: Dict) -> Dict[str, list]:
+    """Normalise a history row to {field: [old, new]}."""
+    if row["changes"]:
+        return dict(row["changes"])
+    if row["field_name"]:
+        return {row["field_name"]: [row["old_value"], row["new_value"]]}
+    return {}
+
+
+def _merge_run(run: List[Dict]) -> Dict:
+    """Collapse consecutive edits into one row: first old value -> last new value per field."""
+    merged: Dict[str, list] = {}
+    for row in run:
+        for field, (old, new) in _field_changes(row).items():
+            if field in merged:
+                merged[field][1] = new
+            else:
+                merged[field] = [old, new]
+
+    last = dict(run[-1])
+    if len(merged) == 1:
+        field, (old, new) = next(iter(merged.items()))
+        last.update(field_name=field, old_value=old, new_value=new, changes=None)
+    else:
+        last.update(field_name=None, old_value=None, new_value=None, changes=merged)
+    last["description"] = f"{last['description'] or 'Task updated'} ({len(run)} edits compacted)"
+    return last
+
+
+def compact_task_history(rows: List[Dict]) -> List[Dict]:
+    """
+    Collapse runs of consecutive 'updated' entries on the same task by the
+    same user into a single entry (keeps the id and time of the last one).
+    """
+    rows = sorted(rows, key=lambda r: (r["task_id"], r["created_at"], r["id"]))
+    out: List[Dict] = []
+    run: List[Dict] = []
+
+    def close_run():
+        if run:
+            out.append(run[0] if len(run) == 1 else _merge_run(run))
+            run.clear()
+
+    for row in rows:
+        if row["action"] != models.HistoryAction.updated:
+            close_run()
+            out.append(row)
+            continue
+        if run and (run[-1]["task_id"] != row["task_id"] or run[-1]["user_id"] != row["user_id"]):
+            close_run()
+        run.append(row)
+    close_run()
+    return out
+
+
+def _archive_batch(db: Session, hot, cold, time_column: str, cutoff: datetime, batch_size: int, compact=None) -> int:
+    rows = [
+        dict(r) for r in db.execute(
+            select(hot).where(hot.c[time_column] < cutoff).order_by(hot.c.id).limit(batch_size)
+        ).mappings()
+    ]
+    if not rows:
+        return 0
+
+    archived = compact(rows) if compact else rows
+    db.execute(insert(cold), archived)
+    db.execute(delete(hot).where(hot.c.id.in_([r["id"] for r in rows])))
+    db.commit()
+    return len(rows)
+
+
+def archive_history(
+    db: Session,
+    older_than_days: int = settings.HISTORY_ARCHIVE_AFTER_DAYS,
+    batch_size: int = settings.HISTORY_ARCHIVE_BATCH_SIZE,
+    compact: bool = settings.HISTORY_ARCHIVE_COMPACT,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Move history older than `older_than_days` into the archive tables,
+    one bounded batch (one short transaction) at a time.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    moved = {"task_history": 0, "project_history": 0}
+    jobs = (
+        ("task_history", models.TaskHistory.__table__, models.TaskHistoryArchive.__table__,
+         "created_at", compact_task_history if compact else None),
+        ("project_history", models.ProjectHistory.__table__, models.ProjectHistoryArchive.__table__,
+         "timestamp", None),
+    )
+    for name, hot, cold, time_column, compactor in jobs:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            count = _archive_batch(db, hot, cold, time_column, cutoff, batch_size, compactor)
+            moved[name] += count
+            batches += 1
+            if count < batch_size:
+                break
+    return moved
+
+
+def merge_tiers(hot: list, cold: list, time_attr: str) -> list:
+    """Newest-first merge of hot and archived history rows (ids are unique across tiers)."""
+    return sorted(
+        [*hot, *cold],
+        key=lambda h: (getattr(h, time_attr) or datetime.min, h.id),
+        reverse=True,
+    )
+
+
+def page_tiers(hot: list, cold: list, time_attr: str, limit: int):
+    """
+    Merge one keyset page from each tier (each fetched with LIMIT limit + 1)
+    into a single page plus the cursor for the next one.
+    """
+    return paginate(merge_tiers(hot, cold, time_attr), limit, lambda h: (getattr(h, time_attr), h.id))
+
+
+class HistoryArchiver:
+    """Background thread running archive_history() every N minutes."""
+
+    def __init__(self, interval_minutes: int):
+        self.interval = interval_minutes * 60
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run: Optional[datetime] = None
+        self.last_result: Dict[str, int] = {}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="history-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        from app.db.database import SessionLocal
+
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                self.last_result = archive_history(db)
+                self.last_run = datetime.utcnow()
+            except Exception:
+                db.rollback()
+                logger.exception("History archival failed")
+            finally:
+                db.close()
+
+
+history_archiver = HistoryArchiver(settings.HISTORY_ARCHIVE_INTERVAL_MINUTES)
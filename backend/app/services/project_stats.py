@@ -0,0 +1,145 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+from sqlalchemy import case, delete, event, func, insert, select, update
+from sqlalchemy.orm import Session, attributes
+from app.db import models
+
+# ─────────────────────────────
+#  Materialized project stats
+# ─────────────────────────────
+# project_stats holds one row of counters per project. A flush listener
+# turns every Task insert / update / delete into `col = col + delta`
+# UPDATEs on the same connection, so the counters commit (or roll back)
+# together with the change. Progress reads become primary-key lookups.
+#
+# The listener is registered when this module is imported (the routers
+# that read the stats do so). Anything that writes tasks with Core
+# statements bypasses it; rebuild_project_stats() repairs that drift.
+
+STATUS_COLUMNS = {status.value: status.value for status in models.TaskStatus}
+_TRACKED = ("project_id", "status", "estimated_hours", "actual_hours")
+Stats = models.ProjectStats
+
+
+def _status_value(status) -> Optional[str]:
+    return getattr(status, "value", status)
+
+
+def _contribution(project_id, status, estimated, actual, sign: int) -> Dict[int, Dict[str, float]]:
+    if project_id is None:
+        return {}
+    deltas = {"total_tasks": sign, "estimated_hours": sign * (estimated or 0), "actual_hours": sign * (actual or 0)}
+    column = STATUS_COLUMNS.get(_status_value(status))
+    if column:
+        deltas[column] = sign
+    return {project_id: deltas}
+
+
+def _values(task, when: str) -> tuple:
+    # when="old": committed values; when="new": values just flushed
+    values = []
+    for key in _TRACKED:
+        history = attributes.get_history(task, key)
+        if when == "old":
+            current = history.deleted or history.unchanged
+        else:
+            current = history.added or history.unchanged
+        values.append(current[0] if current else None)
+    return tuple(values)
+
+
+def _merge(into: Dict, deltas: Dict) -> None:
+    for project_id, columns in deltas.items():
+        for column, delta in columns.items():
+            into[project_id][column] += delta
+
+
+def _collect_deltas(session: Session) -> Dict[int, Dict[str, float]]:
+    totals: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+    for task in session.new:
+        if isinstance(task, models.Task):
+            _merge(totals, _contribution(*_values(task, "new"), sign=1))
+    for task in session.deleted:
+        if isinstance(task, models.Task):
+            _merge(totals, _contribution(*_values(task, "old"), sign=-1))
+    for task in session.dirty:
+        if isinstance(task, models.Task) and any(attributes.get_history(task, key).has_changes() for key in _TRACKED):
+            _merge(totals, _contribution(*_values(task, "old"), sign=-1))
+            _merge(totals, _contribution(*_values(task, "new"), sign=1))
+    return totals
+
+
+# Load the previous value on assignment even when the attribute was
+# expired, so the flush always knows what to subtract
+for _key in _TRACKED:
+    event.listen(getattr(models.Task, _key), "set", lambda *args: None, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_task_deltas(session: Session, flush_context):
+    new_projects = [p.id for p in session.new if isinstance(p, models.Project)]
+    deleted_projects = {p.id for p in session.deleted if isinstance(p, models.Project)}
+    deltas = _collect_deltas(session)
+    if not (new_projects or deleted_projects or deltas):
+        return
+    conn = session.connection()
+
+    if new_projects:
+        conn.execute(insert(Stats), [{"project_id": pid} for pid in new_projects])
+    if deleted_projects:
+        # Also covered by the FK cascade, but not every backend enforces it
+        conn.execute(delete(Stats).where(Stats.project_id.in_(deleted_projects)))
+
+    for project_id, columns in deltas.items():
+        if project_id in deleted_projects:
+            continue
+        changes = {name: getattr(Stats, name) + delta for name, delta in columns.items() if delta}
+        if not changes:
+            continue
+        result = conn.execute(update(Stats).where(Stats.project_id == project_id).values(**changes))
+        if result.rowcount == 0:
+            # No row yet (project predates the table): build it from the already-flushed tasks
+            rebuild_project_stats(conn, [project_id])
+
+
+# ---- rebuild (drift repair) ----
+def project_stats_select(project_ids: Optional[Iterable[int]] = None):
+    """Aggregate the tasks table into project_stats rows (one per project, zeros included)."""
+    Task = models.Task
+    stmt = (
+        select(
+            models.Project.id,
+            func.count(Task.id),
+            *[func.coalesce(func.sum(case((Task.status == status, 1), else_=0)), 0) for status in models.TaskStatus],
+            func.coalesce(func.sum(Task.estimated_hours), 0),
+            func.coalesce(func.sum(Task.actual_hours), 0),
+        )
+        .outerjoin(Task, Task.project_id == models.Project.id)
+        .group_by(models.Project.id)
+    )
+    if project_ids is not None:
+        stmt = stmt.where(models.Project.id.in_(list(project_ids)))
+    return stmt
+
+
+def rebuild_project_stats(conn, project_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute stats rows from tasks (all projects, or just `project_ids`)."""
+    if project_ids is not None:
+        project_ids = list(project_ids)
+    columns = ["project_id", "total_tasks", *STATUS_COLUMNS.values(), "estimated_hours", "actual_hours"]
+    clear = delete(Stats)
+    if project_ids is not None:
+        clear = clear.where(Stats.project_id.in_(project_ids))
+    conn.execute(clear)
+    return conn.execute(insert(Stats).from_select(columns, project_stats_select(project_ids))).rowcount
+
+
+# ---- reads ----
+def project_stats_stmt(project_id: int):
+    return select(Stats).where(Stats.project_id == project_id)
+
+
+def done_percent(stats) -> float:
+    if stats is None or not stats.total_tasks:
+        return 0.0
+    return stats.done / stats.total_tasks * 100
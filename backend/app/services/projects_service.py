@@ -0,0 +1,96 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Sequence
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.db import models
+
+# -----------------------------
+# member_ids without loading User rows
+# -----------------------------
+# ProjectOut.member_ids reads Project.member_ids, which falls back to the
+# `members` relationship. For listings, fetch the ids for the whole page in
+# one query over project_members (served by its primary key) instead.
+def member_ids_stmt(project_ids: Sequence[int]):
+    pm = models.project_members
+    return (
+        select(pm.c.project_id, pm.c.user_id)
+        .where(pm.c.project_id.in_(project_ids))
+        .order_by(pm.c.project_id, pm.c.user_id)
+    )
+
+
+def attach_member_ids(projects: Sequence[models.Project], rows) -> None:
+    by_project: Dict[int, List[int]] = defaultdict(list)
+    for project_id, user_id in rows:
+        by_project[project_id].append(user_id)
+    for project in projects:
+        project.preload_member_ids(by_project.get(project.id, []))
+
+
+def load_member_ids(db: Session, projects: Sequence[models.Project]) -> Sequence[models.Project]:
+    if projects:
+        attach_member_ids(projects, db.execute(member_ids_stmt([p.id for p in projects])).all())
+    return projects
+
+
+def visible_project_ids(user_id: int):
+    """Ids of projects the user is a member of (subquery)."""
+    return select(models.project_members.c.project_id).where(
+        models.project_members.c.user_id == user_id
+    )
+
+
+# -----------------------------
+# Projections (?view=summary)
+# -----------------------------
+PROJECT_SUMMARY_COLUMNS = (
+    models.Project.id, models.Project.title, models.Project.description,
+    models.Project.is_archived, models.Project.created_at,
+)
+
+
+# -----------------------------
+# Batch progress
+# -----------------------------
+# Progress, overdue and member counts for many projects in one SELECT:
+# project_stats (maintained counters) plus two grouped derived tables,
+# all restricted to `scope`, a subquery of the project ids to report on.
+def progress_batch_stmt(scope):
+    Task, pm, Stats = models.Task, models.project_members, models.ProjectStats
+    overdue = (
+        select(Task.project_id, func.count(Task.id).label("overdue_tasks"))
+        .where(Task.project_id.in_(scope), Task.due_date < datetime.utcnow(), Task.status != "done")
+        .group_by(Task.project_id)
+        .subquery()
+    )
+    members = (
+        select(pm.c.project_id, func.count(pm.c.user_id).label("member_count"))
+        .where(pm.c.project_id.in_(scope))
+        .group_by(pm.c.project_id)
+        .subquery()
+    )
+    return (
+        select(
+            models.Project.id.label("project_id"),
+            func.coalesce(Stats.total_tasks, 0).label("total_tasks"),
+            func.coalesce(Stats.done, 0).label("completed_tasks"),
+            func.coalesce(overdue.c.overdue_tasks, 0).label("overdue_tasks"),
+            func.coalesce(members.c.member_count, 0).label("member_count"),
+        )
+        .outerjoin(Stats, Stats.project_id == models.Project.id)
+        .outerjoin(overdue, overdue.c.project_id == models.Project.id)
+        .outerjoin(members, members.c.project_id == models.Project.id)
+        .where(models.Project.id.in_(scope))
+        .order_by(models.Project.id)
+    )
+
+
+def progress_batch_result(rows) -> List[dict]:
+    return [
+        dict(
+            row._asdict(),
+            completion_percent=(row.completed_tasks / row.total_tasks * 100) if row.total_tasks else 0.0,
+        )
+        for row in rows
+    ]
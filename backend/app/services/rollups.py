@@ -0,0 +1,189 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import models
+from app.services.project_stats import STATUS_COLUMNS
+from app.services.timesheets import rebuild_weekly_hours
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────
+#  Daily project rollups
+# ─────────────────────────────
+# One project_daily_stats row per project per UTC day: tasks per status at
+# the end of the day, estimated hours still open, and hours logged.
+#
+# A day's statuses are reconstructed by starting from each task's current
+# status and rewinding the status changes recorded after that day (both
+# history tiers), so a run only reads history from the start of its
+# window. Runs replace every row in their window, so re-running is safe.
+# Without arguments a run resumes at the last stored day (which may have
+# been written before that day ended); on an empty table it backfills
+# from the first task.
+#
+# The same run rewrites weekly_hours for the weeks its window touches.
+#
+# Known gaps: deleted tasks (and their history) are gone, and
+# remaining_hours uses today's estimates for past days.
+Daily = models.ProjectDailyStats
+BATCH_SIZE = 1000  # rows per yield_per partition while scanning
+_STATUS_ACTIONS = (models.HistoryAction.status_changed, models.HistoryAction.updated)
+
+
+def _parse_status(value) -> Optional[str]:
+    if value is None:
+        return None
+    # Older rows hold str(TaskStatus.x), i.e. "TaskStatus.todo"
+    name = str(getattr(value, "value", value)).rsplit(".", 1)[-1]
+    return name if name in STATUS_COLUMNS else None
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _day_end(day: date) -> datetime:
+    return datetime.combine(day + timedelta(days=1), time.min)
+
+
+def _status_changes(db: Session, since: datetime) -> Dict[int, List[Tuple[datetime, str]]]:
+    """task_id -> [(changed_at, previous status)], newest first, from `since` on."""
+    changes: Dict[int, List[Tuple[datetime, str]]] = defaultdict(list)
+    for model in (models.TaskHistoryArchive, models.TaskHistory):
+        stmt = select(model.task_id, model.created_at, model.action, model.old_value, model.changes).where(
+            model.created_at >= since, model.action.in_(_STATUS_ACTIONS)
+        )
+        for row in db.execute(stmt.execution_options(yield_per=BATCH_SIZE)):
+            if row.action == models.HistoryAction.status_changed:
+                previous = row.old_value
+            else:
+                # PUT /tasks/{id} records status edits inside `changes`
+                change = (row.changes or {}).get("status")
+                if not change:
+                    continue
+                previous = change[0]
+            previous = _parse_status(previous)
+            if previous is not None and row.created_at is not None:
+                changes[row.task_id].append((_naive_utc(row.created_at), previous))
+    for task_changes in changes.values():
+        task_changes.sort(reverse=True)
+    return changes
+
+
+def _empty_row() -> dict:
+    return dict({column: 0 for column in STATUS_COLUMNS}, remaining_hours=0.0, hours_logged=0.0)
+
+
+def compute_daily_rows(db: Session, start: date, end: date) -> Dict[Tuple[int, date], dict]:
+    """Rollup rows for every project and day in [start, end]."""
+    window_start, window_end = datetime.combine(start, time.min), _day_end(end)
+    days = [end - timedelta(days=n) for n in range((end - start).days + 1)]  # newest first
+    changes = _status_changes(db, window_start)
+    rows: Dict[Tuple[int, date], dict] = defaultdict(_empty_row)
+
+    Task = models.Task
+    tasks = select(Task.id, Task.project_id, Task.created_at, Task.status, Task.estimated_hours).where(
+        Task.project_id.isnot(None), Task.created_at < window_end
+    )
+    for task in db.execute(tasks.execution_options(yield_per=BATCH_SIZE)):
+        created_at = _naive_utc(task.created_at)
+        status, task_changes, i = _parse_status(task.status), changes.get(task.id, ()), 0
+        for day in days:
+            day_end = _day_end(day)
+            if created_at >= day_end:
+                break  # not created yet on this or any earlier day
+            while i < len(task_changes) and task_changes[i][0] >= day_end:
+                status = task_changes[i][1]
+                i += 1
+            if status is None:
+                continue
+            row = rows[(task.project_id, day)]
+            row[status] += 1
+            if status != "done":
+                row["remaining_hours"] += task.estimated_hours or 0
+
+    logs = (
+        select(Task.project_id, models.TimeLog.log_date, models.TimeLog.hours)
+        .join(Task, Task.id == models.TimeLog.task_id)
+        .where(models.TimeLog.log_date >= window_start, models.TimeLog.log_date < window_end)
+    )
+    for project_id, log_date, hours in db.execute(logs.execution_options(yield_per=BATCH_SIZE)):
+        rows[(project_id, _naive_utc(log_date).date())]["hours_logged"] += hours or 0
+    return rows
+
+
+def run_rollups(db: Session, since: Optional[date] = None, through: Optional[date] = None) -> int:
+    """Rewrite the rollup rows for [since, through]; returns the number of rows written."""
+    through = through or datetime.utcnow().date()
+    if since is None:
+        since = db.scalar(select(func.max(Daily.day)))
+        if since is None:
+            first_task = db.scalar(select(func.min(models.Task.created_at)))
+            if first_task is None:
+                return 0
+            since = _naive_utc(first_task).date()
+    if since > through:
+        return 0
+
+    rows = compute_daily_rows(db, since, through)
+    db.execute(delete(Daily).where(Daily.day >= since, Daily.day <= through))
+    if rows:
+        db.execute(insert(Daily), [dict(values, project_id=pid, day=day) for (pid, day), values in rows.items()])
+    rebuild_weekly_hours(db, since, through)
+    db.commit()
+    return len(rows)
+
+
+# ---- reads ----
+def daily_stats_stmt(project_id: int, since: date, until: date):
+    return (
+        select(Daily)
+        .where(Daily.project_id == project_id, Daily.day >= since, Daily.day <= until)
+        .order_by(Daily.day)
+    )
+
+
+class DailyRollup:
+    """Background thread running run_rollups() every N minutes."""
+
+    def __init__(self, interval_minutes: int):
+        self.interval = interval_minutes * 60
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run: Optional[datetime] = None
+        self.last_result = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="daily-rollup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        from app.db.database import SessionLocal
+
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                self.last_result = run_rollups(db)
+                self.last_run = datetime.utcnow()
+            except Exception:
+                db.rollback()
+                logger.exception("Daily rollup failed")
+            finally:
+                db.close()
+
+
+daily_rollup = DailyRollup(settings.ROLLUP_INTERVAL_MINUTES)
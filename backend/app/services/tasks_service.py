@@ -1,15 +1,182 @@
-from sqlalchemy.orm import Session
-from fastapi import HTTPException
-from app.db import models
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from fastapi import HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import models, schemas
+from app.services.versions import task_list_version, task_list_version_stmt
+from app.utils.conditional import not_modified, set_version_headers
+from app.utils.pagination import decode_cursor, keyset_after, keyset_order, paginate
+from app.utils.projections import View
+from app.utils.responses import adapter_response
+
+# -----------------------------
+# Loader strategies
+# -----------------------------
+# Every task response nests assignee / createdBy (and project for
+# TaskDetails). Load them with one SELECT ... IN per relationship instead
+# of one lazy load per row.
+def task_out_loaders(with_project: bool = False) -> list:
+    loaders = [selectinload(models.Task.assignee), selectinload(models.Task.createdBy)]
+    if with_project:
+        loaders.append(selectinload(models.Task.project))
+    return loaders
+
+
+# -----------------------------
+# List filters / sorting / cursor
+# -----------------------------
+# Only indexed columns are sortable: (column, nullable)
+TASK_SORTS = {
+    "created_at": (models.Task.created_at, False),
+    "updated_at": (models.Task.updated_at, False),
+    "due_date": (models.Task.due_date, True),  # tasks without a due date come last
+    "id": (models.Task.id, False),
+}
+
+
+@dataclass
+class TaskListParams:
+    status: Optional[models.TaskStatus] = None
+    priority: Optional[models.TaskPriority] = None
+    assignee_id: Optional[int] = None
+    created_by: Optional[int] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+    sort: str = "created_at"
+    order: str = "desc"
+    limit: int = 100
+    cursor: Optional[str] = None
+    view: View = "full"
+
+
+def task_list_params(
+    status: Optional[models.TaskStatus] = None,
+    priority: Optional[models.TaskPriority] = None,
+    assignee_id: Optional[int] = None,
+    created_by: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    sort: Literal["created_at", "updated_at", "due_date", "id"] = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    view: View = Query("full", description="summary: flat TaskSummary rows, no nested objects"),
+) -> TaskListParams:
+    """Query parameters shared by every task list endpoint."""
+    return TaskListParams(
+        status=status, priority=priority, assignee_id=assignee_id, created_by=created_by,
+        due_after=due_after, due_before=due_before, updated_since=updated_since,
+        sort=sort, order=order, limit=limit, cursor=cursor, view=view,
+    )
+
+
+def apply_task_list_params(stmt, params: TaskListParams):
+    """Filters + keyset ORDER BY / LIMIT (limit + 1, see page_tasks) on a select(Task)."""
+    Task = models.Task
+    if params.status is not None:
+        stmt = stmt.where(Task.status == params.status)
+    if params.priority is not None:
+        stmt = stmt.where(Task.priority == params.priority)
+    if params.assignee_id is not None:
+        stmt = stmt.where(Task.assignee_id == params.assignee_id)
+    if params.created_by is not None:
+        stmt = stmt.where(Task.created_by == params.created_by)
+    if params.due_after is not None:
+        stmt = stmt.where(Task.due_date >= params.due_after)
+    if params.due_before is not None:
+        stmt = stmt.where(Task.due_date < params.due_before)
+    if params.updated_since is not None:
+        stmt = stmt.where(Task.updated_at >= params.updated_since)
+
+    column, nullable = TASK_SORTS[params.sort]
+    descending = params.order == "desc"
+    cursor = decode_cursor(params.cursor, 3)
+    if cursor is not None:
+        # Cursors carry the sort they were issued for
+        if cursor[0] != f"{params.sort}:{params.order}":
+            raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+        stmt = stmt.where(keyset_after(column, Task.id, cursor[1:], descending, nullable))
+
+    return stmt.order_by(*keyset_order(column, Task.id, descending, nullable)).limit(params.limit + 1)
+
+
+def page_tasks(rows: list, params: TaskListParams):
+    return paginate(
+        rows, params.limit,
+        lambda t: (f"{params.sort}:{params.order}", getattr(t, params.sort), t.id),
+    )
+
+
+# -----------------------------
+# Projections
+# -----------------------------
+# view=summary selects only these columns (every sortable column is
+# included so page_tasks can build the cursor from the row).
+TASK_SUMMARY_COLUMNS = (
+    models.Task.id, models.Task.title, models.Task.status, models.Task.priority,
+    models.Task.due_date, models.Task.project_id, models.Task.assignee_id,
+    models.Task.created_at, models.Task.updated_at,
+)
+
+
+def _page_adapter(params: TaskListParams, with_project: bool):
+    if params.view == "summary":
+        return schemas.task_summary_adapter
+    return schemas.task_details_list_adapter if with_project else schemas.task_out_list_adapter
+
+
+def _view_stmt(stmt, params: TaskListParams, with_project: bool):
+    if params.view == "summary":
+        return stmt.with_only_columns(*TASK_SUMMARY_COLUMNS)
+    return stmt.options(*task_out_loaders(with_project))
+
+
+def _page_rows(result, params: TaskListParams) -> list:
+    # full: Task entities; summary: column rows
+    return result.scalars().all() if params.view == "full" else result.all()
+
+
+def task_page(db: Session, request: Request, stmt, params: TaskListParams, user_id: int, with_project: bool = False):
+    """
+    Run a list statement from apply_task_list_params() in the requested view
+    and serialize the page with the matching precompiled list adapter.
+    A matching If-None-Match / If-Modified-Since gets a 304 after only the
+    version aggregate.
+    """
+    version = task_list_version(db.execute(task_list_version_stmt(stmt)).one(), user_id)
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+    result = db.execute(_view_stmt(stmt, params, with_project))
+    rows, next_cursor = page_tasks(_page_rows(result, params), params)
+    return set_version_headers(adapter_response(_page_adapter(params, with_project), rows, next_cursor), version)
+
+
+async def task_page_async(
+    db: AsyncSession, request: Request, stmt, params: TaskListParams, user_id: int, with_project: bool = False
+):
+    version = task_list_version((await db.execute(task_list_version_stmt(stmt))).one(), user_id)
+    cached = not_modified(request, version)
+    if cached is not None:
+        return cached
+    result = await db.execute(_view_stmt(stmt, params, with_project))
+    rows, next_cursor = page_tasks(_page_rows(result, params), params)
+    return set_version_headers(adapter_response(_page_adapter(params, with_project), rows, next_cursor), version)
+
 
 def get_tasks_for_user(
-    db: Session, target_user_id: int, current_user: models.User
+    db: Session, target_user_id: int, current_user
 ):
     """
-    Returns a SQLAlchemy query for tasks assigned to target_user_id,
+    Returns a select(Task) statement for tasks assigned to target_user_id,
     filtered according to the current_user's role and project membership.
     """
-    target_user = db.query(models.User).filter(models.User.id == target_user_id).first()
+    target_user = db.get(models.User, target_user_id)
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -17,41 +184,42 @@ def get_tasks_for_user(
 
     # 🔹 Admin: can view all tasks for any user
     if role == "admin":
-        return db.query(models.Task)
+        return select(models.Task)
 
     # 🔹 Developer: can only view their own tasks
     elif role == "developer":
         if current_user.id != target_user_id:
             raise HTTPException(status_code=403, detail="Not permitted")
-        return db.query(models.Task).filter(models.Task.assignee_id == target_user_id)
+        return select(models.Task).where(models.Task.assignee_id == target_user_id)
 
     # 🔹 Manager: can view
     #   - their own tasks
     #   - tasks of developers who are in the same project(s)
     elif role == "manager":
-        # Step 1: find all project IDs where the manager is a member
-        manager_project_ids = [
-            p.id for p in current_user.projects
-        ]
+        # Step 1: project IDs where the manager is a member
+        manager_project_ids = select(models.project_members.c.project_id).where(
+            models.project_members.c.user_id == current_user.id
+        )
 
-        if not manager_project_ids:
+        if db.scalar(manager_project_ids.limit(1)) is None:
             raise HTTPException(status_code=403, detail="Manager has no projects")
 
+        developer_ids = (
+            select(models.User.id)
+            .join(models.Role, models.User.role_id == models.Role.id)
+            .where(models.Role.name == "developer")
+        )
+
         # Step 2: allow tasks if:
         #   - assignee is the manager themselves
         #   - OR assignee is a developer in one of manager's projects
-        return (
-            db.query(models.Task)
-            .join(models.Project, models.Task.project_id == models.Project.id)
-            .join(models.User, models.Task.assignee_id == models.User.id)
-            .filter(
-                (models.Task.assignee_id == current_user.id) |
-                (
-                    (models.Project.id.in_(manager_project_ids)) &
-                    (models.User.role.has(name="developer"))
-                )
+        # (IN subqueries instead of JOIN + DISTINCT, so any ORDER BY stays valid)
+        return select(models.Task).where(
+            (models.Task.assignee_id == current_user.id) |
+            (
+                models.Task.project_id.in_(manager_project_ids) &
+                models.Task.assignee_id.in_(developer_ids)
             )
-            .distinct()
         )
 
     else:
@@ -0,0 +1,176 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.db import models
+
+# ─────────────────────────────
+#  Timesheets / hours reports
+# ─────────────────────────────
+# Grouped SQL over time_logs (joined to tasks for the project): the
+# database sums hours per (key, day) and the handful of day rows are
+# folded into ISO weeks here, which keeps the SQL portable (no
+# dialect-specific week functions).
+#
+# weekly_hours holds the same sums per (week, project, user), rewritten
+# by the rollup job; reports read it with ?source=rollup when the last
+# run is fresh enough for them.
+Granularity = Literal["day", "week"]
+Source = Literal["live", "rollup"]
+TimeLog, Task, Weekly = models.TimeLog, models.Task, models.WeeklyHours
+
+
+def as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])  # SQLite returns DATE() as text
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _period(day, granularity: Granularity) -> date:
+    day = as_date(day)
+    return week_start(day) if granularity == "week" else day
+
+
+def _scoped(stmt, project_column, project_id: Optional[int], visible_project_ids):
+    if project_id is not None:
+        stmt = stmt.where(project_column == project_id)
+    if visible_project_ids is not None:
+        stmt = stmt.where(project_column.in_(visible_project_ids))
+    return stmt
+
+
+def _in_window(stmt, since: date, until: date):
+    return stmt.where(
+        TimeLog.log_date >= datetime.combine(since, time.min),
+        TimeLog.log_date < datetime.combine(until + timedelta(days=1), time.min),
+    )
+
+
+def fold(rows, keys: Tuple[str, ...], granularity: Granularity, period_attr: str = "day") -> List[dict]:
+    """Sum `hours` per (keys..., period); rows are (key..., day-or-week, hours)."""
+    totals: Dict[tuple, float] = defaultdict(float)
+    for row in rows:
+        key = tuple(getattr(row, k) for k in keys)
+        totals[key + (_period(getattr(row, period_attr), granularity),)] += row.hours or 0
+    return [
+        dict(zip(keys, key[:-1]), period=key[-1], hours=round(hours, 2))
+        for key, hours in sorted(totals.items(), key=lambda item: item[0][:1] + item[0][-1:])
+    ]
+
+
+# ---- live (time_logs) ----
+# visible_project_ids (a subquery, None for admins) limits every report to
+# hours logged on those projects' tasks.
+def hours_by_user_stmt(since: date, until: date, project_id: Optional[int] = None, user_id: Optional[int] = None, visible_project_ids=None):
+    day = func.date(TimeLog.log_date).label("day")
+    stmt = (
+        select(TimeLog.user_id, models.User.name.label("user_name"), day, func.sum(TimeLog.hours).label("hours"))
+        .join(models.User, models.User.id == TimeLog.user_id)
+        .group_by(TimeLog.user_id, models.User.name, day)
+    )
+    if project_id is not None or visible_project_ids is not None:
+        stmt = _scoped(stmt.join(Task, Task.id == TimeLog.task_id), Task.project_id, project_id, visible_project_ids)
+    if user_id is not None:
+        stmt = stmt.where(TimeLog.user_id == user_id)
+    return _in_window(stmt, since, until)
+
+
+def hours_by_project_stmt(since: date, until: date, project_id: Optional[int] = None, visible_project_ids=None):
+    day = func.date(TimeLog.log_date).label("day")
+    stmt = (
+        select(Task.project_id, models.Project.title.label("project_title"), day, func.sum(TimeLog.hours).label("hours"))
+        .join(Task, Task.id == TimeLog.task_id)
+        .join(models.Project, models.Project.id == Task.project_id)
+        .group_by(Task.project_id, models.Project.title, day)
+    )
+    return _in_window(_scoped(stmt, Task.project_id, project_id, visible_project_ids), since, until)
+
+
+# ---- pre-aggregated (weekly_hours) ----
+def _weeks(stmt, since: date, until: date):
+    return stmt.where(Weekly.week_start >= week_start(since), Weekly.week_start <= until)
+
+
+def weekly_by_user_stmt(since: date, until: date, project_id: Optional[int] = None, user_id: Optional[int] = None, visible_project_ids=None):
+    stmt = (
+        select(Weekly.user_id, models.User.name.label("user_name"), Weekly.week_start, func.sum(Weekly.hours).label("hours"))
+        .join(models.User, models.User.id == Weekly.user_id)
+        .group_by(Weekly.user_id, models.User.name, Weekly.week_start)
+    )
+    stmt = _scoped(stmt, Weekly.project_id, project_id, visible_project_ids)
+    if user_id is not None:
+        stmt = stmt.where(Weekly.user_id == user_id)
+    return _weeks(stmt, since, until)
+
+
+def weekly_by_project_stmt(since: date, until: date, project_id: Optional[int] = None, visible_project_ids=None):
+    stmt = (
+        select(Weekly.project_id, models.Project.title.label("project_title"), Weekly.week_start, func.sum(Weekly.hours).label("hours"))
+        .join(models.Project, models.Project.id == Weekly.project_id)
+        .group_by(Weekly.project_id, models.Project.title, Weekly.week_start)
+    )
+    return _weeks(_scoped(stmt, Weekly.project_id, project_id, visible_project_ids), since, until)
+
+
+def rebuild_weekly_hours(db: Session, since: date, through: date) -> int:
+    """Rewrite weekly_hours for every week touching [since, through] (no commit)."""
+    first_week = week_start(since)
+    # Every week touched is rewritten whole, so read logs to its Sunday:
+    # stopping at `through` would store a partial last week
+    last_day = week_start(through) + timedelta(days=6)
+    day = func.date(TimeLog.log_date).label("day")
+    stmt = _in_window(
+        select(Task.project_id, TimeLog.user_id, day, func.sum(TimeLog.hours).label("hours"))
+        .join(Task, Task.id == TimeLog.task_id)
+        .where(Task.project_id.isnot(None))
+        .group_by(Task.project_id, TimeLog.user_id, day),
+        first_week, last_day,
+    )
+    rows = fold(db.execute(stmt).all(), ("project_id", "user_id"), "week")
+    db.execute(delete(Weekly).where(Weekly.week_start >= first_week, Weekly.week_start <= through))
+    if rows:
+        db.execute(insert(Weekly), [
+            {"project_id": r["project_id"], "user_id": r["user_id"], "week_start": r["period"], "hours": r["hours"]}
+            for r in rows
+        ])
+    return len(rows)
+
+
+# ---- estimated vs actual (project_stats) ----
+def estimates_stmt(project_ids: Optional[Iterable[int]] = None, visible_project_ids=None):
+    Stats = models.ProjectStats
+    stmt = (
+        select(
+            Stats.project_id, models.Project.title.label("project_title"),
+            Stats.estimated_hours, Stats.actual_hours, Stats.total_tasks, Stats.done,
+        )
+        .join(models.Project, models.Project.id == Stats.project_id)
+        .order_by(Stats.project_id)
+    )
+    if project_ids is not None:
+        stmt = stmt.where(Stats.project_id.in_(list(project_ids)))
+    if visible_project_ids is not None:
+        stmt = stmt.where(Stats.project_id.in_(visible_project_ids))
+    return stmt
+
+
+def estimates_result(rows) -> List[dict]:
+    return [
+        {
+            "project_id": r.project_id,
+            "project_title": r.project_title,
+            "estimated_hours": round(r.estimated_hours, 2),
+            "actual_hours": round(r.actual_hours, 2),
+            "variance_hours": round(r.actual_hours - r.estimated_hours, 2),
+            "total_tasks": r.total_tasks,
+            "done": r.done,
+        }
+        for r in rows
+    ]
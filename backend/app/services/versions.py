@@ -0,0 +1,119 @@
+from sqlalchemy import func, select, true
+from app.db import models
+from app.utils.conditional import Version, make_version
+
+# ─────────────────────────────
+#  Representation versions
+# ─────────────────────────────
+# One aggregate query per resource, cheap enough to run before deciding
+# whether to answer 304. Each version covers the row's own updated_at plus
+# the children the response embeds (tasks and members of a project, the
+# project of a task). Users have no updated_at, so a rename alone does not
+# change the ETag of responses that embed that user.
+
+def _cross(first, *single_rows):
+    # The aggregate subqueries are one row each: join them ON TRUE, an
+    # explicit cross join (a bare multi-FROM SELECT warns as a cartesian product)
+    joined = first
+    for subquery in single_rows:
+        joined = joined.join(subquery, true())
+    return joined
+
+
+def _latest(*values):
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+# ---- task (TaskDetails) ----
+def task_version_stmt(task_id: int):
+    # Also returns what get_task needs for its access check
+    Task = models.Task
+    return (
+        select(
+            Task.id, Task.updated_at, Task.project_id, Task.assignee_id,
+            models.Project.updated_at.label("project_updated_at"),
+        )
+        .outerjoin(models.Project, models.Project.id == Task.project_id)
+        .where(Task.id == task_id)
+    )
+
+
+def task_version(row) -> Version:
+    return make_version(
+        "task", row.id, row.updated_at, row.project_id, row.project_updated_at,
+        last_modified=_latest(row.updated_at, row.project_updated_at),
+    )
+
+
+# ---- project (ProjectDetail) ----
+def project_version_stmt(project_id: int):
+    Task, pm = models.Task, models.project_members
+    tasks = select(
+        func.count(Task.id).label("task_count"),
+        func.max(Task.updated_at).label("task_updated_at"),
+        func.coalesce(func.sum(Task.id), 0).label("task_id_sum"),
+    ).where(Task.project_id == project_id).subquery()
+    members = select(
+        func.count(pm.c.user_id).label("member_count"),
+        func.coalesce(func.sum(pm.c.user_id), 0).label("member_id_sum"),
+    ).where(pm.c.project_id == project_id).subquery()
+    return (
+        select(models.Project.id, models.Project.updated_at, tasks, members)
+        .select_from(_cross(models.Project.__table__, tasks, members))
+        .where(models.Project.id == project_id)
+    )
+
+
+def project_version(row) -> Version:
+    return make_version(
+        "project", row.id, row.updated_at,
+        row.task_count, row.task_updated_at, row.task_id_sum, row.member_count, row.member_id_sum,
+        last_modified=_latest(row.updated_at, row.task_updated_at),
+    )
+
+
+# ---- task lists ----
+def task_list_version_stmt(list_stmt):
+    """
+    Aggregate over the page a list statement (filters + cursor + ORDER BY /
+    LIMIT) returns, look-ahead row included: the same bounded index range
+    as the page itself, never every matching row.
+    """
+    Task = models.Task
+    page = list_stmt.with_only_columns(Task.id, Task.updated_at).subquery()
+    return select(func.count(page.c.id), func.max(page.c.updated_at), func.coalesce(func.sum(page.c.id), 0))
+
+
+def task_list_version(row, *scope) -> Version:
+    # scope: caller id, so users sharing a browser cache never share a tag
+    count, last_updated, id_sum = row
+    return make_version("tasks", *scope, count, last_updated, id_sum, last_modified=last_updated)
+
+
+# ---- history (append-only; archival moves rows between tiers) ----
+def _history_aggregates(model, owner: str, owner_id: int, time_attr: str, tier: str):
+    return select(
+        func.count(model.id).label(f"{tier}_count"),
+        func.max(model.id).label(f"{tier}_max_id"),
+        func.max(getattr(model, time_attr)).label(f"{tier}_latest"),
+    ).where(getattr(model, owner) == owner_id).subquery()
+
+
+def task_history_version_stmt(task_id: int):
+    hot = _history_aggregates(models.TaskHistory, "task_id", task_id, "created_at", "hot")
+    cold = _history_aggregates(models.TaskHistoryArchive, "task_id", task_id, "created_at", "cold")
+    return select(hot, cold).select_from(_cross(hot, cold))
+
+
+def project_history_version_stmt(project_id: int):
+    hot = _history_aggregates(models.ProjectHistory, "project_id", project_id, "timestamp", "hot")
+    cold = _history_aggregates(models.ProjectHistoryArchive, "project_id", project_id, "timestamp", "cold")
+    return select(hot, cold).select_from(_cross(hot, cold))
+
+
+def history_version(kind: str, owner_id: int, row) -> Version:
+    return make_version(
+        kind, owner_id, row.hot_count, row.hot_max_id, row.cold_count, row.cold_max_id,
+        last_modified=_latest(row.hot_latest, row.cold_latest),
+    )
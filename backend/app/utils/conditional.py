@@ -0,0 +1,71 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+
+# Conditional GET: handlers compute a cheap Version (one aggregate query),
+# answer 304 when the client already has it, and otherwise attach the
+# ETag / Last-Modified headers to the full response.
+CACHE_CONTROL = "private, no-cache"  # always revalidate
+
+
+@dataclass(frozen=True)
+class Version:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def _utc(dt: datetime) -> datetime:
+    # DB timestamps come back naive; they are stored in UTC
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def make_version(kind: str, *parts: Any, last_modified: Optional[datetime] = None) -> Version:
+    """Strong ETag from the parts that change whenever the representation does."""
+    raw = repr((kind, *[p.isoformat() if isinstance(p, datetime) else p for p in parts]))
+    etag = '"%s"' % hashlib.sha1(raw.encode()).hexdigest()[:24]
+    return Version(etag=etag, last_modified=_utc(last_modified) if last_modified else None)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= _utc(since)
+
+
+def version_headers(version: Version) -> dict:
+    headers = {"ETag": version.etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+    if version.last_modified:
+        headers["Last-Modified"] = format_datetime(version.last_modified, usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, version: Version) -> Optional[Response]:
+    """304 response if the request's validators match `version`, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, version.etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        matched = bool(
+            if_modified_since and version.last_modified
+            and _not_modified_since(if_modified_since, version.last_modified)
+        )
+    if matched:
+        return Response(status_code=304, headers=version_headers(version))
+    return None
+
+
+def set_version_headers(response: Response, version: Version) -> Response:
+    response.headers.update(version_headers(version))
+    return response
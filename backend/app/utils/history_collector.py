@@ -0,0 +1,89 @@
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List
+from app.db import models
+from app.utils.history_sink import history_sink, write_history_rows
+
+_INFO_KEY = "history_collector"
+_PENDING_KEY = "history_write_behind"
+
+
+class HistoryCollector:
+    """
+    Request-scoped buffer of TaskHistory / ProjectHistory events.
+
+    Lives in `session.info`, so it is scoped exactly like the request's
+    Session. Events keep a reference to the task/project object; ids are
+    resolved at commit time, after the flush that assigns them. The event
+    time is stamped here (naive UTC, like the rest of the app) rather than
+    by the server default, which with the write-behind sink would be the
+    time of the batch INSERT.
+    """
+
+    def __init__(self):
+        self.task_events: List[tuple] = []
+        self.project_events: List[tuple] = []
+
+    def add_task_event(self, task: models.Task, **fields: Any) -> None:
+        fields.setdefault("created_at", datetime.utcnow())
+        self.task_events.append((task, fields))
+
+    def add_project_event(self, project: models.Project, **fields: Any) -> None:
+        fields.setdefault("timestamp", datetime.utcnow())
+        self.project_events.append((project, fields))
+
+    def __bool__(self) -> bool:
+        return bool(self.task_events or self.project_events)
+
+    def drain(self):
+        task_rows: List[Dict[str, Any]] = [dict(fields, task_id=task.id) for task, fields in self.task_events]
+        project_rows: List[Dict[str, Any]] = [dict(fields, project_id=project.id) for project, fields in self.project_events]
+        self.clear()
+        return task_rows, project_rows
+
+    def clear(self) -> None:
+        self.task_events.clear()
+        self.project_events.clear()
+
+
+def get_history_collector(db: Session) -> HistoryCollector:
+    collector = db.info.get(_INFO_KEY)
+    if collector is None:
+        collector = db.info[_INFO_KEY] = HistoryCollector()
+    return collector
+
+
+# By default history is written inside the same transaction as the change
+# it describes, right before the one COMMIT of the request. With the
+# write-behind sink running, rows are queued once the COMMIT succeeded
+# instead, unless the queue is full.
+@event.listens_for(Session, "before_commit")
+def _flush_collected_history(session: Session):
+    collector = session.info.get(_INFO_KEY)
+    if not collector:
+        return
+    session.flush()  # assigns ids to tasks/projects created in this transaction
+    task_rows, project_rows = collector.drain()
+    if history_sink.has_room(len(task_rows) + len(project_rows)):
+        session.info[_PENDING_KEY] = (task_rows, project_rows)
+    else:
+        if history_sink.running:
+            history_sink.note_sync_fallback()  # queue full: backpressure
+        write_history_rows(session, task_rows, project_rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed_history(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and not history_sink.offer(*pending):
+        # Lost the race for the last slots: write now, in a separate transaction
+        history_sink.write_now(*pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_collected_history(session: Session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+    collector = session.info.get(_INFO_KEY)
+    if collector:
+        collector.clear()
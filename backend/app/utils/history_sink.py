@@ -0,0 +1,163 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import models
+
+logger = logging.getLogger(__name__)
+
+
+def write_history_rows(db: Session, task_rows: List[Dict], project_rows: List[Dict]) -> None:
+    """Multi-row INSERTs (one executemany per table)."""
+    if task_rows:
+        db.execute(insert(models.TaskHistory), task_rows)
+    if project_rows:
+        db.execute(insert(models.ProjectHistory), project_rows)
+
+
+class HistoryWriteBehind:
+    """
+    Optional asynchronous sink for history rows.
+
+    Committed requests hand their rows to a bounded in-process queue; a
+    background thread drains it every `interval_ms` (or as soon as
+    `batch_size` rows are waiting) with multi-row INSERTs. When the queue
+    has no room the caller writes synchronously instead (backpressure).
+
+    Rows carry their event time (stamped when recorded), so a late flush
+    never shifts created_at / timestamp. A batch that fails is split in
+    halves and retried, so one bad row (e.g. its task was deleted in the
+    meantime) loses only itself.
+    """
+
+    def __init__(self, maxsize: int, interval_ms: int, batch_size: int):
+        self.maxsize = maxsize
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.sync_fallbacks = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def has_room(self, count: int) -> bool:
+        return self.running and self._queue.qsize() + count <= self.maxsize
+
+    def offer(self, task_rows: List[Dict], project_rows: List[Dict]) -> bool:
+        """Queue all rows, or none of them. Returns False when full."""
+        rows = [("task", r) for r in task_rows] + [("project", r) for r in project_rows]
+        with self._lock:
+            if not self.has_room(len(rows)):
+                self.sync_fallbacks += 1
+                return False
+            for row in rows:
+                self._queue.put_nowait(row)
+            self.enqueued += len(rows)
+        return True
+
+    def note_sync_fallback(self) -> None:
+        with self._lock:
+            self.sync_fallbacks += 1
+
+    # ---- background worker ----
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="history-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting work and flush everything still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _take_batch(self) -> List[tuple]:
+        batch = []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+
+    def _insert(self, batch: List[tuple]) -> bool:
+        from app.db.database import SessionLocal
+
+        task_rows = [row for kind, row in batch if kind == "task"]
+        project_rows = [row for kind, row in batch if kind == "project"]
+        db = SessionLocal()
+        try:
+            write_history_rows(db, task_rows, project_rows)
+            db.commit()
+            return True
+        except Exception:
+            db.rollback()
+            if len(batch) == 1:
+                logger.exception("Dropped history row %r", batch[0][1])
+            else:
+                logger.warning("Failed to write %d history rows; retrying in halves", len(batch), exc_info=True)
+            return False
+        finally:
+            db.close()
+
+    def _write(self, batch: List[tuple]) -> None:
+        if self._insert(batch):
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+        elif len(batch) == 1:
+            with self._lock:
+                self.failed += 1
+        else:
+            half = len(batch) // 2
+            self._write(batch[:half])
+            self._write(batch[half:])
+
+    def write_now(self, task_rows: List[Dict], project_rows: List[Dict]) -> None:
+        """Synchronous fallback, in its own transaction."""
+        self._write([("task", r) for r in task_rows] + [("project", r) for r in project_rows])
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "maxsize": self.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "sync_fallbacks": self.sync_fallbacks,
+            "failed": self.failed,
+        }
+
+
+history_sink = HistoryWriteBehind(
+    maxsize=settings.HISTORY_QUEUE_SIZE,
+    interval_ms=settings.HISTORY_FLUSH_INTERVAL_MS,
+    batch_size=settings.HISTORY_BATCH_SIZE,
+)
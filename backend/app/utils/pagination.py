@@ -0,0 +1,80 @@
+import base64
+import json
+import operator
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+# List endpoints keep returning a plain JSON array; the opaque cursor for
+# the next page travels in this header (exposed to the browser via CORS).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if hasattr(value, "value"):  # enums
+        return value.value
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str], size: int) -> Optional[List[Any]]:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_order(column, id_column, descending: bool = True, nullable: bool = False) -> list:
+    """ORDER BY for a (column, id) keyset; NULLs of a nullable column always sort last."""
+    direction = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+    order = [column.is_(None)] if nullable else []
+    return order + [direction(column), direction(id_column)]
+
+
+def keyset_after(column, id_column, cursor: Optional[List[Any]], descending: bool = True, nullable: bool = False):
+    """WHERE clause for rows strictly after `cursor` = (value, id) in keyset_order()."""
+    if cursor is None:
+        return None
+    value, last_id = cursor
+    op = operator.lt if descending else operator.gt
+    if nullable and value is None:
+        return and_(column.is_(None), op(id_column, last_id))
+    clause = or_(op(column, value), and_(column == value, op(id_column, last_id)))
+    if nullable:
+        clause = or_(clause, column.is_(None))
+    return clause
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def paginate(rows: list, limit: int, key) -> Tuple[list, Optional[str]]:
+    """
+    `rows` were fetched with LIMIT limit + 1: trim to `limit` and build the
+    cursor for the next page from the last row kept (None on the last page).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
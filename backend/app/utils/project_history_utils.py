@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 from app.db import models
+from app.utils.history_collector import get_history_collector
 
 
 def log_project_history(
@@ -13,17 +14,17 @@ def log_project_history(
     new_value: Any = None,
     description: str = None  # <-- add this
 ):
-    history = models.ProjectHistory(
-        project_id=project.id,
+    # Inserted together with the change itself on the next db.commit()
+    get_history_collector(db).add_project_event(
+        project,
         user_id=user.id,
         action=action,
         field=field,
         old_value=old_value,
         new_value=new_value,
+        changes=None,
         description=description
     )
-    db.add(history)
-    db.commit()
 
 
 def detect_project_changes(project: models.Project, data: dict):
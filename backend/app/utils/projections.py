@@ -0,0 +1,7 @@
+from typing import Literal
+
+# Named projections for list endpoints:
+#   full    - the endpoint's response_model (nested objects, default)
+#   summary - a flat schema built from a column-only SELECT, serialized
+#             with adapter_response() (app/utils/responses.py)
+View = Literal["full", "summary"]
@@ -0,0 +1,32 @@
+from typing import Any, Optional
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.utils.pagination import set_next_cursor
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson instead of json.dumps for the final encode."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def adapter_response(
+    adapter: TypeAdapter,
+    data: Any,
+    next_cursor: Optional[str] = None,
+    validated: bool = False,
+) -> Response:
+    """
+    Serialize `data` straight to JSON bytes with a precompiled TypeAdapter
+    (pydantic-core, no jsonable_encoder pass), bypassing the route's
+    response_model. Pass validated=True when `data` already holds schema
+    instances, so they are not validated a second time.
+    """
+    if not validated:
+        data = adapter.validate_python(data, from_attributes=True)
+    response = Response(content=adapter.dump_json(data), media_type="application/json")
+    set_next_cursor(response, next_cursor)
+    return response
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.db import models
 from typing import Optional, Dict
+from app.utils.history_collector import get_history_collector
 
 def log_task_history(
     db: Session,
@@ -14,11 +15,11 @@ def log_task_history(
     description: Optional[str] = None,
 ):
     """
-    Creates a TaskHistory record for any change on a task.
+    Records a TaskHistory event for any change on a task.
+    It is inserted together with the change itself on the next db.commit().
     """
-
-    history_entry = models.TaskHistory(
-        task_id=task.id,
+    get_history_collector(db).add_task_event(
+        task,
         user_id=user.id if user else None,
         action=action,
         field_name=field_name,
@@ -28,11 +29,6 @@ def log_task_history(
         description=description,
     )
 
-    db.add(history_entry)
-    db.commit()
-    db.refresh(history_entry)
-    return history_entry
-
 
 def detect_task_changes(task, update_data: dict):
     """
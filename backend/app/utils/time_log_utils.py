@@ -17,7 +17,7 @@ def create_time_log(db: Session, task: models.Task, user: models.User, hours: fl
     task.actual_hours = (task.actual_hours or 0) + hours
     db.add(task)
 
-    # 3️⃣ Add history entry
+    # 3️⃣ Add history entry (written by the commit below, same transaction)
     log_task_history(
         db=db,
         task=task,
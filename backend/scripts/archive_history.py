@@ -0,0 +1,34 @@
+"""
+Move old task/project history into the archive tables (run from cron, or
+set HISTORY_ARCHIVE_ENABLED to let one app worker do it in the background).
+
+    python scripts/archive_history.py [--days 180] [--batch-size 1000] [--compact]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.history_archiver import archive_history
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=settings.HISTORY_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.HISTORY_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--compact", action="store_true", default=settings.HISTORY_ARCHIVE_COMPACT)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = archive_history(db, older_than_days=args.days, batch_size=args.batch_size, compact=args.compact)
+    finally:
+        db.close()
+    print(f"Archived {moved['task_history']} task history and {moved['project_history']} project history rows")
+
+
+if __name__ == "__main__":
+    main()
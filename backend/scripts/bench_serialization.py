@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: serializing N TaskOut rows to a JSON response body.
+
+    legacy   per-row from_orm().dict(), re-validated by response_model,
+             encoded with json.dumps (what list_comments used to do)
+    default  response_model validation + dump, json.dumps
+             (FastAPI's default path for a list response)
+    adapter  precompiled TypeAdapter: validate + dump_json in pydantic-core
+             (adapter_response in app/utils/responses.py)
+
+    python scripts/bench_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench-serialization")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.responses import JSONResponse
+from app.db import models, schemas
+from app.utils.responses import FastJSONResponse, adapter_response
+
+
+def make_rows(count: int) -> list:
+    """Transient ORM objects shaped like a loaded task list page."""
+    now = datetime(2024, 1, 1)
+    users = [
+        models.User(id=i, name=f"User {i}", email=f"user{i}@example.com", avatar=None)
+        for i in range(1, 51)
+    ]
+    return [
+        models.Task(
+            id=i,
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet " * 4,
+            status=models.TaskStatus.in_progress,
+            priority=models.TaskPriority.medium,
+            due_date=now + timedelta(days=i % 30),
+            estimated_hours=8.0,
+            actual_hours=3.5,
+            project_id=1 + i % 20,
+            assignee=users[i % 50],
+            createdBy=users[(i + 7) % 50],
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def legacy(rows):
+    dicts = [schemas.TaskOut.from_orm(r).dict() for r in rows]
+    validated = schemas.task_out_list_adapter.validate_python(dicts)
+    return JSONResponse(schemas.task_out_list_adapter.dump_python(validated, mode="json")).body
+
+
+def default(rows):
+    validated = schemas.task_out_list_adapter.validate_python(rows, from_attributes=True)
+    return JSONResponse(schemas.task_out_list_adapter.dump_python(validated, mode="json")).body
+
+
+def default_orjson(rows):
+    validated = schemas.task_out_list_adapter.validate_python(rows, from_attributes=True)
+    return FastJSONResponse(schemas.task_out_list_adapter.dump_python(validated, mode="json")).body
+
+
+def adapter(rows):
+    return adapter_response(schemas.task_out_list_adapter, rows).body
+
+
+def best_of(fn, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    baseline = None
+    print(f"Serializing {args.rows} TaskOut rows (best of {args.repeat}):")
+    for name, fn in (("legacy", legacy), ("default", default), ("default+orjson", default_orjson), ("adapter", adapter)):
+        seconds = best_of(fn, rows, args.repeat)
+        baseline = baseline or seconds
+        print(f"  {name:16} {seconds * 1000:8.1f} ms   {baseline / seconds:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
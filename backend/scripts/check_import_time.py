@@ -0,0 +1,82 @@
+"""
+Import-time budget check.
+
+Imports app.main and builds the app in a fresh interpreter, then fails if
+either step is over budget or if a database connection was opened.
+
+The framework app.main builds on (FastAPI, Starlette, pydantic-settings)
+is imported first and reported separately: it alone takes ~400 ms, which
+this code cannot change, so the import budget covers only the app's own
+modules.
+
+    python scripts/check_import_time.py [--import-budget-ms 100] [--build-budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROBE = r"""
+import json, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+connections = []
+event.listen(Engine, "connect", lambda *args: connections.append(1))  # every engine, any pool
+tf = time.perf_counter()
+# Baseline: third-party modules app.main imports at module level
+import fastapi, fastapi.middleware.cors, fastapi.staticfiles, starlette.concurrency, pydantic_settings
+t0 = time.perf_counter()
+import app.main as main
+t1 = time.perf_counter()
+opened_on_import = len(connections)
+main.create_app()
+t2 = time.perf_counter()
+opened_on_build = len(connections) - opened_on_import
+print(json.dumps({
+    "framework_ms": (t0 - tf) * 1000,
+    "import_ms": (t1 - t0) * 1000,
+    "build_ms": (t2 - t1) * 1000,
+    "connections_on_import": opened_on_import,
+    "connections_on_build": opened_on_build,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget-ms", type=float, default=100.0)
+    parser.add_argument("--build-budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "import-time-check")
+    probe = subprocess.run([sys.executable, "-c", PROBE], cwd=backend_dir, env=env, capture_output=True, text=True)
+    if probe.returncode != 0:
+        print(probe.stderr, file=sys.stderr)
+        sys.exit("❌ importing / building the app failed")
+    out = probe.stdout.strip().splitlines()[-1]
+
+    result = json.loads(out)
+    print(f"framework:       {result['framework_ms']:.1f} ms (not budgeted)")
+    print(f"import app.main: {result['import_ms']:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"create_app():    {result['build_ms']:.1f} ms (budget {args.build_budget_ms:.0f} ms)")
+
+    failures = []
+    if result["import_ms"] > args.import_budget_ms:
+        failures.append("import is over budget")
+    if result["build_ms"] > args.build_budget_ms:
+        failures.append("app build is over budget")
+    if result["connections_on_import"] or result["connections_on_build"]:
+        failures.append("a database connection was opened before startup")
+
+    if failures:
+        print("❌ " + "; ".join(failures))
+        sys.exit(1)
+    print("✅ within budget")
+
+
+if __name__ == "__main__":
+    main()
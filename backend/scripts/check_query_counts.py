@@ -0,0 +1,130 @@
+"""
+N+1 regression check for task and project listings.
+
+Seeds a throwaway SQLite database twice (small and large), calls each
+endpoint against both and fails if the number of SQL statements per
+request grows with the number of rows, or if an endpoint listed in
+PINNED issues more statements than its budget.
+
+    python scripts/check_query_counts.py [--small 5] [--large 50]
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "query-count-check")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # create_app() mounts ./static
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import models
+from app.db.database import Base, get_db
+from app.db.replicas import get_read_db
+from app.deps import get_current_principal, get_current_user
+from app.main import create_app
+
+ENDPOINTS = [
+    "/api/tasks/?limit=500",
+    "/api/users/{admin_id}/tasks?limit=500",
+    "/api/users/{dev_id}/assigned-tasks?limit=500",
+    "/api/projects/{project_id}",
+    "/api/projects/",
+    "/api/projects/user",
+    "/api/reporting/summary",
+    "/api/reporting/project_progress/{project_id}",
+    "/api/projects/{project_id}/progress",
+]
+
+# Exact statement budgets (single-pass conditional aggregation)
+PINNED = {
+    "/api/reporting/summary": 1,
+    "/api/reporting/project_progress/{project_id}": 1,
+    "/api/projects/{project_id}/progress": 1,
+}
+
+
+def seed(db, rows: int) -> dict:
+    admin_role = models.Role(name="admin")
+    dev_role = models.Role(name="developer")
+    admin = models.User(name="Admin", email="admin@example.com", hashed_password="x", role=admin_role)
+    dev = models.User(name="Dev", email="dev@example.com", hashed_password="x", role=dev_role)
+    project = models.Project(title="Project", description="", members=[admin, dev])
+    db.add_all([admin_role, dev_role, admin, dev, project])
+
+    # A distinct creator per task, so lazy loads cannot hit the identity map
+    for i in range(rows):
+        creator = models.User(name=f"User {i}", email=f"user{i}@example.com", hashed_password="x", role=dev_role)
+        db.add(models.Task(title=f"Task {i}", description="", project=project, assignee=dev, createdBy=creator))
+        db.add(models.Project(title=f"Project {i}", description="", members=[admin, creator]))
+    db.commit()
+    return {"admin_id": admin.id, "dev_id": dev.id, "project_id": project.id}
+
+
+def count_queries(rows: int) -> dict:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        ids = seed(db, rows)
+        admin = db.get(models.User, ids["admin_id"])
+        admin.role  # loaded before the session closes
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[get_current_principal] = lambda: admin
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    counts = {}
+    with TestClient(app) as client:
+        for template in ENDPOINTS:
+            statements.clear()
+            response = client.get(template.format(**ids))
+            response.raise_for_status()
+            counts[template] = len(statements)
+    engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small", type=int, default=5)
+    parser.add_argument("--large", type=int, default=50)
+    args = parser.parse_args()
+
+    small, large = count_queries(args.small), count_queries(args.large)
+
+    failures = []
+    for template in ENDPOINTS:
+        print(f"{template:48} {small[template]:3} queries @ {args.small} rows, {large[template]:3} @ {args.large} rows")
+        if large[template] > small[template]:
+            failures.append(template)
+        elif template in PINNED and large[template] != PINNED[template]:
+            failures.append(f"{template} (expected {PINNED[template]})")
+
+    if failures:
+        print("❌ query count grows with rows or exceeds its budget: " + ", ".join(failures))
+        sys.exit(1)
+    print("✅ constant query count")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Recompute the project_stats counters from the tasks table (repairs drift
+left by writes that bypass the ORM, e.g. manual SQL or bulk imports).
+
+    python scripts/rebuild_project_stats.py [--project-id 12 --project-id 40]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.database import SessionLocal
+from app.services.project_stats import rebuild_project_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project-id", type=int, action="append", help="only these projects (default: all)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_project_stats(db.connection(), args.project_id)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt stats for {rebuilt} projects")
+
+
+if __name__ == "__main__":
+    main()
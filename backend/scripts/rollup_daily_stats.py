@@ -0,0 +1,35 @@
+"""
+Write the per-project daily rollups used by the burndown and cumulative
+flow reports (run from cron, or set ROLLUP_ENABLED to let one app worker
+do it in the background). Without --since it resumes at the last stored
+day, or backfills everything on the first run.
+
+    python scripts/rollup_daily_stats.py [--since 2024-01-01] [--through 2024-03-31]
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.database import SessionLocal
+from app.services.rollups import run_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, default=None)
+    parser.add_argument("--through", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = run_rollups(db, since=args.since, through=args.through)
+    finally:
+        db.close()
+    print(f"Wrote {written} project/day rollup rows")
+
+
+if __name__ == "__main__":
+    main()
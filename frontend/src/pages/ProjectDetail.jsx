@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import api from "../services/api";
+import api, { nextCursor } from "../services/api";
 import { useAuth } from "../context/AuthContext";
 import { formatDate, isOverdue } from "../utils/dateUtils";
 import UserAvatar from "../components/UserAvatar";
@@ -32,6 +32,7 @@ export default function ProjectDetail() {
 
   const [projectHistory, setProjectHistory] = useState([]);
   const [loadingProjectHistory, setLoadingProjectHistory] = useState(true);
+  const [projectHistoryCursor, setProjectHistoryCursor] = useState(null);
   const [openAccordion, setOpenAccordion] = useState("info");
 
   const pageSize = 5;
@@ -191,6 +192,7 @@ export default function ProjectDetail() {
       try {
         const res = await api.get(`/projects/${project.id}/history`);
         setProjectHistory(res.data);
+        setProjectHistoryCursor(nextCursor(res));
       } catch (err) {
         console.error("Error fetching project history", err);
       } finally {
@@ -201,6 +203,17 @@ export default function ProjectDetail() {
     if (project) fetchHistory();
   }, [project]);
 
+  // History comes newest first, one page at a time
+  const loadOlderProjectHistory = async () => {
+    try {
+      const res = await api.get(`/projects/${project.id}/history`, { params: { cursor: projectHistoryCursor } });
+      setProjectHistory((prev) => [...prev, ...res.data]);
+      setProjectHistoryCursor(nextCursor(res));
+    } catch (err) {
+      console.error("Error fetching project history", err);
+    }
+  };
+
 
   if (!project) return <div className="p-6">Loading project details...</div>;
 
@@ -502,6 +515,15 @@ export default function ProjectDetail() {
               </ul>
 
             )}
+
+            {projectHistoryCursor && (
+              <button
+                onClick={loadOlderProjectHistory}
+                className="mt-3 text-blue-600 hover:underline text-sm font-medium"
+              >
+                Load older
+              </button>
+            )}
           </div>
         )}
       </div>
@@ -29,19 +29,16 @@ useEffect(() => {
       const res = await api.get("/projects/");
       setProjects(res.data);
 
-      // Fetch progress for each project
+      // Fetch progress for all of the user's projects in one request
       const progressData = {};
-      await Promise.all(
-        res.data.map(async (p) => {
-          try {
-            const progressRes = await api.get(`/projects/${p.id}/progress`);
-            progressData[p.id] = progressRes.data.completion_percent || 0;
-          } catch (err) {
-            console.error(`Failed to fetch progress for project ${p.id}`, err);
-            progressData[p.id] = 0;
-          }
-        })
-      );
+      try {
+        const progressRes = await api.get("/projects/progress/batch");
+        progressRes.data.forEach((p) => {
+          progressData[p.project_id] = p.completion_percent || 0;
+        });
+      } catch (err) {
+        console.error("Failed to fetch project progress", err);
+      }
       setProgressMap(progressData);
     } catch (err) {
       console.error(err);
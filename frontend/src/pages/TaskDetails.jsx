@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { useParams, useLocation, Link } from "react-router-dom";
-import api from "../services/api";
+import api, { nextCursor } from "../services/api";
 import { useAuth } from "../context/AuthContext";
 import { formatDate, isOverdue } from "../utils/dateUtils";
 import UserAvatar from "../components/UserAvatar";
@@ -33,6 +33,7 @@ export default function TaskDetails() {
 
   const [history, setHistory] = useState([]);
   const [loadingHistory, setLoadingHistory] = useState(true);
+  const [historyCursor, setHistoryCursor] = useState(null);
 
   const [openAccordion, setOpenAccordion] = useState("comments");
 
@@ -192,6 +193,7 @@ export default function TaskDetails() {
       try {
         const res = await api.get(`/tasks/${task.id}/history`);
         setHistory(res.data);
+        setHistoryCursor(nextCursor(res));
       } catch (err) {
         console.error("Error loading task history:", err);
       } finally {
@@ -201,6 +203,17 @@ export default function TaskDetails() {
     fetchHistory();
   }, [task]);
 
+  // History comes newest first, one page at a time
+  const loadOlderHistory = async () => {
+    try {
+      const res = await api.get(`/tasks/${task.id}/history`, { params: { cursor: historyCursor } });
+      setHistory((prev) => [...prev, ...res.data]);
+      setHistoryCursor(nextCursor(res));
+    } catch (err) {
+      console.error("Error loading task history:", err);
+    }
+  };
+
   // fetch time logs
   useEffect(() => {
     if (!task) return;
@@ -793,6 +806,15 @@ export default function TaskDetails() {
                 </ul>
               )}
 
+              {historyCursor && (
+                <button
+                  onClick={loadOlderHistory}
+                  className="mt-3 text-blue-600 hover:underline text-sm font-medium"
+                >
+                  Load older
+                </button>
+              )}
+
             </div>
           )}
         </div>
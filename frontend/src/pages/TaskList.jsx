@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useMemo } from "react";
-import api from "../services/api";
+import api, { getAllPages } from "../services/api";
 import { useAuth } from "../context/AuthContext";
 import { formatDate, isOverdue } from "../utils/dateUtils";
 import { useParams, useNavigate } from "react-router-dom";
@@ -47,8 +47,7 @@ export default function TaskList() {
       try {
         const res = await api.get(`/users/me`);
         const userId = res.data.id;
-        const taskRes = await api.get(`/users/${userId}/tasks`);
-        setTasks(taskRes.data);
+        setTasks(await getAllPages(`/users/${userId}/tasks`, { limit: 500 }));
       } catch (err) {
         console.error("Error loading tasks:", err);
       }
@@ -151,8 +150,7 @@ export default function TaskList() {
 
       const updated = await api.get(`/users/me`);
       const userId = updated.data.id;
-      const refreshed = await api.get(`/users/${userId}/tasks`);
-      setTasks(refreshed.data);
+      setTasks(await getAllPages(`/users/${userId}/tasks`, { limit: 500 }));
     } catch (err) {
       console.error("Error updating task:", err);
       alert("Failed to update task.");
@@ -173,8 +171,7 @@ export default function TaskList() {
 
       const res = await api.get(`/users/me`);
       const userId = res.data.id;
-      const refreshed = await api.get(`/users/${userId}/tasks`);
-      setTasks(refreshed.data);
+      setTasks(await getAllPages(`/users/${userId}/tasks`, { limit: 500 }));
     } catch (err) {
       alert("Error adding task");
       console.error(err);
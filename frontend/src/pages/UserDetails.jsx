@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import api from "../services/api";
+import api, { getAllPages } from "../services/api";
 import { useAuth } from "../context/AuthContext";
 import UserAvatar from "../components/UserAvatar";
 
@@ -37,8 +37,7 @@ export default function UserDetails() {
   const fetchAssignedTasks = async () => {
     setLoadingTasks(true);
     try {
-      const res = await api.get(`/users/${id}/assigned-tasks`);
-      setTasks(res.data);
+      setTasks(await getAllPages(`/users/${id}/assigned-tasks`, { limit: 500 }));
     } catch (err) {
       console.error("Failed to load assigned tasks:", err);
     } finally {
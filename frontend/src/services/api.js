@@ -8,6 +8,12 @@ const api = axios.create({
   timeout: 10000,
 })
 
+// 📚 Read-your-writes with read replicas: the API stamps every write with
+// X-Last-Write, and sending it back keeps our next reads on the primary
+// (the cookie it also sets isn't sent on cross-origin calls)
+const LAST_WRITE_HEADER = 'x-last-write'
+let lastWrite = null
+
 // 🔐 Automatically attach JWT token to every request
 api.interceptors.request.use(
   (config) => {
@@ -15,6 +21,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`
     }
+    if (lastWrite) {
+      config.headers[LAST_WRITE_HEADER] = lastWrite
+    }
     return config
   },
   (error) => Promise.reject(error)
@@ -22,7 +31,12 @@ api.interceptors.request.use(
 
 // 🚨 Auto logout on 401 (expired token)
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if (response.headers[LAST_WRITE_HEADER]) {
+      lastWrite = response.headers[LAST_WRITE_HEADER]
+    }
+    return response
+  },
 
   (error) => {
     if (error.response && error.response.status === 401) {
@@ -33,4 +47,22 @@ api.interceptors.response.use(
   }
 )
 
+// 📄 Keyset-paginated lists (tasks, history) return a plain array and put
+// the cursor for the next page in the X-Next-Cursor header.
+export const NEXT_CURSOR_HEADER = 'x-next-cursor'
+
+export const nextCursor = (res) => res.headers[NEXT_CURSOR_HEADER] || null
+
+// Follow X-Next-Cursor until the last page and return every row
+export const getAllPages = async (url, params = {}) => {
+  const rows = []
+  let cursor = null
+  do {
+    const res = await api.get(url, { params: cursor ? { ...params, cursor } : params })
+    rows.push(...res.data)
+    cursor = nextCursor(res)
+  } while (cursor)
+  return rows
+}
+
 export default api